@@ -0,0 +1,70 @@
+"""
+Batched single-document lookups for MongoDB
+Coalesces concurrent find_one-by-key calls into one $in query per short window
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+logger = logging.getLogger(__name__)
+
+
+class BatchLoader:
+    """
+    DataLoader-style loader for one collection and key field
+
+    Every load() made within `delay` seconds of the first pending one is answered
+    by a single find({key_field: {"$in": keys}}); callers each get their own
+    shallow copy of the document (or None if it does not exist).
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, key_field: str, delay: float = 0.001):
+        self.collection = collection
+        self.key_field = key_field
+        self.delay = delay
+        self.pending: Dict[Any, List[asyncio.Future]] = {}
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.flush_tasks = set()
+
+    async def load(self, key: Any) -> Optional[dict]:
+        """Document whose key_field equals key, fetched in the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.setdefault(key, []).append(future)
+
+        if self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.delay, self.start_flush)
+
+        return await future
+
+    def start_flush(self):
+        """Timer callback: run the pending batch as a task (kept referenced until done)"""
+        self.flush_handle = None
+        batch, self.pending = self.pending, {}
+        task = asyncio.ensure_future(self.flush(batch))
+        self.flush_tasks.add(task)
+        task.add_done_callback(self.flush_tasks.discard)
+
+    async def flush(self, batch: Dict[Any, List[asyncio.Future]]):
+        """Fetch every key in the batch with one query and resolve the waiting callers"""
+        try:
+            docs = await self.collection.find(
+                {self.key_field: {"$in": list(batch)}},
+                {"_id": 0}
+            ).to_list(None)
+        except Exception as e:
+            logger.error(f"❌ Batched lookup on {self.collection.name}.{self.key_field} failed: {e}")
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        docs_by_key = {doc.get(self.key_field): doc for doc in docs}
+        for key, futures in batch.items():
+            doc = docs_by_key.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(dict(doc) if doc is not None else None)
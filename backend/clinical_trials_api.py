@@ -5,6 +5,7 @@ Fetches real-time clinical trial data from ClinicalTrials.gov public API
 import requests
 import requests_cache
 import logging
+import threading
 import time
 from typing import Dict, List, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -26,14 +27,21 @@ class ClinicalTrialsAPI:
     
     def __init__(self):
         self.last_request_time = 0
+        self.rate_limit_lock = threading.Lock()
         self.session = requests.Session()
+        # Keep more pooled connections alive - the shared client is used from several worker threads
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=20)
+        self.session.mount("https://", adapter)
     
     def _rate_limit(self):
-        """Enforce rate limiting between requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self.last_request_time = time.time()
+        """Enforce rate limiting between requests (thread-safe - the shared client runs in worker threads)"""
+        # Reserve the next request slot under the lock, then sleep until it outside of it
+        with self.rate_limit_lock:
+            now = time.time()
+            wait = max(0.0, self.last_request_time + self.RATE_LIMIT_DELAY - now)
+            self.last_request_time = now + wait
+        if wait > 0:
+            time.sleep(wait)
     
     @retry(
         retry=retry_if_exception_type((requests.RequestException,)),
@@ -207,3 +215,14 @@ class ClinicalTrialsAPI:
         except Exception as e:
             logger.error(f"Error in search_and_normalize: {e}")
             return []
+
+
+# Global ClinicalTrials.gov client instance (reuses the pooled session and shares rate limiting)
+_clinical_trials_client = None
+
+def get_clinical_trials_client() -> ClinicalTrialsAPI:
+    """Get or create global ClinicalTrials.gov client instance"""
+    global _clinical_trials_client
+    if _clinical_trials_client is None:
+        _clinical_trials_client = ClinicalTrialsAPI()
+    return _clinical_trials_client
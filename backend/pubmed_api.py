@@ -4,6 +4,7 @@ Fetches research publications from NCBI PubMed using E-utilities
 """
 from Bio import Entrez
 import logging
+import threading
 import time
 from typing import List, Dict, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -13,6 +14,12 @@ logger = logging.getLogger(__name__)
 # Set email for NCBI (required)
 Entrez.email = "curalink@example.com"
 
+# In-process cache for search_and_fetch results (Entrez isn't covered by requests_cache)
+SEARCH_CACHE_TTL = 3600  # 1 hour - same freshness window as the ClinicalTrials.gov cache
+SEARCH_CACHE_MAX_SIZE = 1024
+search_cache = {}
+search_cache_time = {}
+
 class PubMedAPI:
     """Client for PubMed E-utilities API"""
     
@@ -30,13 +37,17 @@ class PubMedAPI:
             self.RATE_LIMIT_DELAY = 0.1  # 10 requests per second with key
         
         self.last_request_time = 0
+        self.rate_limit_lock = threading.Lock()
     
     def _rate_limit(self):
-        """Enforce rate limiting between requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self.last_request_time = time.time()
+        """Enforce rate limiting between requests (thread-safe - the shared client runs in worker threads)"""
+        # Reserve the next request slot under the lock, then sleep until it outside of it
+        with self.rate_limit_lock:
+            now = time.time()
+            wait = max(0.0, self.last_request_time + self.RATE_LIMIT_DELAY - now)
+            self.last_request_time = now + wait
+        if wait > 0:
+            time.sleep(wait)
     
     @retry(
         stop=stop_after_attempt(3),
@@ -247,6 +258,12 @@ class PubMedAPI:
         Returns:
             List of article dicts
         """
+        cache_key = (query.strip().lower(), max_results, (disease_area or "").strip().lower())
+        if cache_key in search_cache:
+            if time.time() - search_cache_time.get(cache_key, 0) < SEARCH_CACHE_TTL:
+                # Callers add fields (e.g. url) to the dicts - hand out copies
+                return [dict(article) for article in search_cache[cache_key]]
+        
         try:
             # Enhance query with disease area if provided
             search_query = query
@@ -273,6 +290,16 @@ class PubMedAPI:
                 if i + chunk_size < len(pmids):
                     time.sleep(0.5)
             
+            # Cache successful results only, evicting the oldest entry once full
+            if all_articles:
+                search_cache.pop(cache_key, None)
+                if len(search_cache) >= SEARCH_CACHE_MAX_SIZE:
+                    oldest_key = next(iter(search_cache))
+                    search_cache.pop(oldest_key, None)
+                    search_cache_time.pop(oldest_key, None)
+                search_cache[cache_key] = [dict(article) for article in all_articles]
+                search_cache_time[cache_key] = time.time()
+            
             return all_articles
             
         except Exception as e:
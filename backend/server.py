@@ -1,28 +1,49 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Cookie, Response, Header
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
 import os
+import re
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from typing import List, Optional, Dict, Any
+import orjson
 import uuid
 from datetime import datetime, timezone, timedelta
 import requests
 import time
 from emergentintegrations.llm.chat import LlmChat, UserMessage
+from batch_loader import BatchLoader
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection (bounded pool, tunable per deployment)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '50'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '10'))
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS=300000,
+    waitQueueTimeoutMS=5000
+)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app
-app = FastAPI()
+# Concurrent single-document lookups by key are coalesced into one $in query
+users_by_id = BatchLoader(db.users, "id")
+researcher_profiles_by_user_id = BatchLoader(db.researcher_profiles, "user_id")
+patient_profiles_by_user_id = BatchLoader(db.patient_profiles, "user_id")
+appointments_by_id = BatchLoader(db.appointments, "id")
+
+# Create the main app (orjson serializes the large list responses much faster than stdlib json)
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # LLM Chat for AI summaries
@@ -33,14 +54,15 @@ llm_chat = LlmChat(
 ).with_model("openai", "gpt-4o-mini")
 
 # In-memory cache for summaries (with TTL)
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 import hashlib
+import heapq
 summary_cache = {}
 cache_timestamps = {}
 
 def get_cache_key(text: str) -> str:
-    """Generate cache key from text"""
-    return hashlib.md5(text.encode()).hexdigest()
+    """Generate cache key from text (content hash)"""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
 
 def get_cached_summary(text: str) -> Optional[str]:
     """Get cached summary if available and not expired"""
@@ -71,7 +93,7 @@ async def summarize_clinical_trial(title: str, description: str, disease_areas:
         Concise AI-generated summary (under 30 words)
     """
     # Check cache first
-    cache_text = f"{title}:{description[:200]}"
+    cache_text = f"{title}|{description}"
     cached = get_cached_summary(cache_text)
     if cached:
         return cached
@@ -121,7 +143,7 @@ async def summarize_publication(title: str, abstract: str) -> str:
         Concise AI-generated summary (under 30 words)
     """
     # Check cache first
-    cache_text = f"{title}:{abstract[:200]}"
+    cache_text = f"{title}|{abstract}"
     cached = get_cached_summary(cache_text)
     if cached:
         return cached
@@ -200,6 +222,7 @@ class ResearcherProfile(BaseModel):
     available_for_meetings: bool = True
     open_to_collaboration: bool = False
     bio: Optional[str] = None
+    specialty_tokens: List[str] = []  # Lowercased words from specialties, for forum matching
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class ClinicalTrial(BaseModel):
@@ -518,6 +541,27 @@ class ReviewCreate(BaseModel):
 
 # ============ Helper Functions ============
 
+# Short-lived LRU cache of session token -> (user, session expiry) so the parallel API calls
+# made for each screen don't all repeat the session + user lookups. Other workers' logouts
+# and role changes reach it through the change-stream watcher (watch_cache_invalidations);
+# without a replica set they can take up to SESSION_USER_CACHE_TTL to apply on other workers.
+session_user_cache: "OrderedDict[str, tuple]" = OrderedDict()
+session_user_cache_time = {}
+SESSION_USER_CACHE_TTL = 30  # 30 seconds
+SESSION_USER_CACHE_MAX_SIZE = 10000
+
+def invalidate_session_cache(token: Optional[str] = None, user_id: Optional[str] = None):
+    """Drop cached auth for one token, for all tokens of a user, or (no arguments) everything"""
+    if token is not None:
+        keys = [token]
+    elif user_id is not None:
+        keys = [key for key, (cached_user, _) in session_user_cache.items() if cached_user.id == user_id]
+    else:
+        keys = list(session_user_cache)
+    for key in keys:
+        session_user_cache.pop(key, None)
+        session_user_cache_time.pop(key, None)
+
 async def get_current_user(session_token: Optional[str] = None, authorization: Optional[str] = None) -> Optional[User]:
     """Get user from session token (cookie or header)"""
     token = session_token
@@ -527,6 +571,15 @@ async def get_current_user(session_token: Optional[str] = None, authorization: O
     if not token:
         return None
     
+    # Check cache (still honouring the session's own expiry)
+    if token in session_user_cache:
+        cache_age = time.time() - session_user_cache_time.get(token, 0)
+        cached_user, expires_at = session_user_cache[token]
+        if cache_age < SESSION_USER_CACHE_TTL and expires_at >= datetime.now(timezone.utc):
+            session_user_cache.move_to_end(token)
+            return cached_user
+        invalidate_session_cache(token=token)
+    
     session = await db.user_sessions.find_one({"session_token": token})
     if not session:
         logging.warning(f"AUTH: No session found for token: {token[:20]}...")
@@ -541,7 +594,7 @@ async def get_current_user(session_token: Optional[str] = None, authorization: O
         logging.warning(f"AUTH: Session expired for user_id: {session['user_id']}")
         return None
     
-    user_doc = await db.users.find_one({"id": session["user_id"]}, {"_id": 0})
+    user_doc = await users_by_id.load(session["user_id"])
     if not user_doc:
         logging.error(f"AUTH: User not found for user_id: {session['user_id']}")
         return None
@@ -550,7 +603,77 @@ async def get_current_user(session_token: Optional[str] = None, authorization: O
         user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
     
     logging.info(f"AUTH: Retrieved user from session - Email: {user_doc['email']}, ID: {user_doc['id']}")
-    return User(**user_doc)
+    user = User(**user_doc)
+    
+    # Cache result, evicting the least recently used token once full
+    if len(session_user_cache) >= SESSION_USER_CACHE_MAX_SIZE:
+        oldest_token, _ = session_user_cache.popitem(last=False)
+        session_user_cache_time.pop(oldest_token, None)
+    session_user_cache[token] = (user, expires_at)
+    session_user_cache_time[token] = time.time()
+    
+    return user
+
+# Notification inserts run off the request path; hold references until they finish
+pending_notification_writes = set()
+
+def send_notification_in_background(notif_dict: dict):
+    """Store a notification without holding up the response (failures are logged)"""
+    async def insert_notification():
+        try:
+            await db.notifications.insert_one(notif_dict)
+        except Exception as e:
+            logging.error(f"Failed to store notification for user {notif_dict.get('user_id')}: {e}")
+    
+    task = asyncio.create_task(insert_notification())
+    pending_notification_writes.add(task)
+    task.add_done_callback(pending_notification_writes.discard)
+
+# Case-insensitive collation for exact-term filters (shared with the status index in setup_indexes.py)
+CASE_INSENSITIVE_COLLATION = {"locale": "en", "strength": 2}
+
+def contains_regex(value: str) -> Dict[str, str]:
+    """Case-insensitive substring match on the user's text (escaped, so it is matched literally)"""
+    return {"$regex": re.escape(value), "$options": "i"}
+
+# Default scoring merged into database fallback results (shared, never mutated per item)
+DEFAULT_DB_REASONS = ["Database result"]
+DEFAULT_DB_PATCH = {"relevance_score": 50, "match_reasons": DEFAULT_DB_REASONS}
+
+def specialty_tokens(specialties: List[str]) -> List[str]:
+    """Lowercased word tokens across all specialties, precomputed at profile save time"""
+    return sorted({token for specialty in specialties for token in specialty.lower().split()})
+
+def authors_norm(authors: List[str]) -> List[str]:
+    """Trimmed, lowercased author names stored on publications for indexed equality lookups"""
+    return [author.strip().lower() for author in authors if author and author.strip()]
+
+def expert_search_fields(expert: Dict[str, Any]) -> Dict[str, Any]:
+    """Lowercased copies of the expert fields scored by search, stored alongside the expert"""
+    return {
+        "name_lc": (expert.get("name") or "").lower(),
+        "specialty_lc": (expert.get("specialty") or "").lower(),
+        "bio_lc": (expert.get("bio") or "").lower(),
+        "research_areas_lc": [area.lower() for area in expert.get("research_areas") or []]
+    }
+
+# Field projections for list endpoints - only what scoring and the list views use
+TRIAL_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "title": 1, "description": 1, "phase": 1, "status": 1,
+    "location": 1, "eligibility": 1, "disease_areas": 1, "contact_email": 1,
+    "summary": 1, "url": 1, "source": 1, "created_at": 1
+}
+PUBLICATION_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "pmid": 1, "title": 1, "authors": 1, "abstract": 1,
+    "summary": 1, "journal": 1, "year": 1, "doi": 1, "url": 1,
+    "disease_areas": 1, "source": 1
+}
+EXPERT_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "user_id": 1, "name": 1, "specialty": 1, "location": 1,
+    "email": 1, "profile_url": 1, "is_platform_member": 1, "research_areas": 1, "bio": 1
+}
+# Full expert documents minus the lowercased copies kept only for search scoring
+EXPERT_FULL_PROJECTION = {"_id": 0, "name_lc": 0, "specialty_lc": 0, "bio_lc": 0, "research_areas_lc": 0}
 
 async def generate_ai_summary(text: str, context: str = "medical") -> str:
     """Generate AI summary using LLM"""
@@ -667,6 +790,7 @@ async def google_callback(
         
         # Delete any old sessions for this user
         deleted = await db.user_sessions.delete_many({"user_id": user.id})
+        invalidate_session_cache(user_id=user.id)
         logging.info(f"AUTH: Deleted {deleted.deleted_count} old sessions for user {user.id}")
         
         # Create new session
@@ -816,10 +940,12 @@ async def process_session(data: SessionDataRequest, response: Response):
                 
                 # Delete the old session to prevent contamination
                 await db.user_sessions.delete_one({"session_token": session_token})
+                invalidate_session_cache(token=session_token)
                 logging.info(f"AUTH: Deleted duplicate session token from previous user")
         
         # Delete any existing sessions for this user to prevent duplicates
         deleted = await db.user_sessions.delete_many({"user_id": user.id})
+        invalidate_session_cache(user_id=user.id)
         logging.info(f"AUTH: Deleted {deleted.deleted_count} old sessions for user {user.id} ({user.email})")
         
         # Create new session
@@ -842,6 +968,7 @@ async def process_session(data: SessionDataRequest, response: Response):
         if final_check:
             logging.error(f"AUTH: RACE CONDITION - Session token already exists at insert time!")
             await db.user_sessions.delete_one({"session_token": session_token})
+            invalidate_session_cache(token=session_token)
         
         await db.user_sessions.insert_one(session_dict)
         logging.info(f"AUTH: Successfully created new session for user {user.id}, email: {user.email}")
@@ -908,6 +1035,7 @@ async def logout(
     
     if token:
         deleted = await db.user_sessions.delete_one({"session_token": token})
+        invalidate_session_cache(token=token)
         logging.info(f"AUTH: Logout - Deleted {deleted.deleted_count} session(s) for token {token[:20]}...")
     else:
         logging.warning(f"AUTH: Logout called with no token")
@@ -947,9 +1075,44 @@ async def logout(
 async def clear_all_sessions():
     """Admin endpoint to clear all sessions (for debugging)"""
     result = await db.user_sessions.delete_many({})
+    invalidate_session_cache()
     logging.info(f"AUTH: Cleared ALL sessions - Deleted {result.deleted_count} session(s)")
     return {"status": "success", "deleted_count": result.deleted_count}
 
+# Exposes database hosts and topology - only served when explicitly enabled (e.g. while tuning locally)
+DEBUG_POOL_ENDPOINT_ENABLED = os.environ.get('ENABLE_DEBUG_POOL_ENDPOINT', '').lower() in ('1', 'true', 'yes')
+
+@api_router.get("/debug/pool")
+async def debug_pool(
+    session_token: Optional[str] = Cookie(None),
+    authorization: Optional[str] = Header(None)
+):
+    """Debug endpoint to inspect MongoDB pool settings and topology for tuning"""
+    if not DEBUG_POOL_ENDPOINT_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    
+    user = await get_current_user(session_token, authorization)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    pool_options = client.options.pool_options
+    topology = client.topology_description
+    return {
+        "max_pool_size": pool_options.max_pool_size,
+        "min_pool_size": pool_options.min_pool_size,
+        "max_idle_time_seconds": pool_options.max_idle_time_seconds,
+        "wait_queue_timeout": pool_options.wait_queue_timeout,
+        "topology_type": topology.topology_type_name,
+        "servers": [
+            {
+                "address": f"{server.address[0]}:{server.address[1]}",
+                "type": server.server_type_name,
+                "round_trip_time": server.round_trip_time
+            }
+            for server in topology.server_descriptions().values()
+        ]
+    }
+
 @api_router.get("/auth/debug")
 async def debug_auth(
     session_token: Optional[str] = Cookie(None),
@@ -1011,6 +1174,7 @@ async def set_role(
         {"id": user.id},
         {"$set": {"roles": [role]}}
     )
+    invalidate_session_cache(user_id=user.id)
     
     return {"status": "success", "roles": [role]}
 
@@ -1030,7 +1194,7 @@ async def check_profile(
     }
     
     if "patient" in user.roles:
-        patient_profile = await db.patient_profiles.find_one({"user_id": user.id}, {"_id": 0})
+        patient_profile = await get_patient_profile_cached(user.id)
         result["profiles"]["patient"] = patient_profile is not None
     
     if "researcher" in user.roles:
@@ -1067,42 +1231,84 @@ async def create_patient_profile(
             location=profile_data.location,
             interests=profile_data.interests or []
         )
-        profile_dict = profile.model_dump()
-        profile_dict['created_at'] = profile_dict['created_at'].isoformat()
+        profile_dict = profile.model_dump(mode="json")
         await db.patient_profiles.insert_one(profile_dict)
     
+    invalidate_patient_profile(user.id)
+    
     return {"status": "success"}
 
 # Cache for profiles (10 minutes)
 profile_cache = {}
 profile_cache_time = {}
 PROFILE_CACHE_TTL = 600  # 10 minutes
+PROFILE_CACHE_MAX_SIZE = 10_000
+
+def cache_profile(cache_key: str, profile: Optional[dict]):
+    """Store a profile in the shared cache, evicting the oldest entry once it is full"""
+    profile_cache.pop(cache_key, None)
+    if len(profile_cache) >= PROFILE_CACHE_MAX_SIZE:
+        oldest_key = next(iter(profile_cache))
+        profile_cache.pop(oldest_key, None)
+        profile_cache_time.pop(oldest_key, None)
+    profile_cache[cache_key] = profile
+    profile_cache_time[cache_key] = time.time()
 
-@api_router.get("/patient/profile")
-async def get_patient_profile(
-    session_token: Optional[str] = Cookie(None),
-    authorization: Optional[str] = Header(None)
-):
-    """Get patient profile - OPTIMIZED with caching"""
-    user = await get_current_user(session_token, authorization)
-    if not user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+async def get_researcher_profile_cached(user_id: str) -> Optional[dict]:
+    """Researcher profile by user_id through the shared profile cache (treat the result as read-only)"""
+    cache_key = f"researcher_profile_{user_id}"
+    if cache_key in profile_cache:
+        cache_age = time.time() - profile_cache_time.get(cache_key, 0)
+        if cache_age < PROFILE_CACHE_TTL:
+            return profile_cache[cache_key]
     
-    # Check cache
-    cache_key = f"patient_profile_{user.id}"
+    profile = await researcher_profiles_by_user_id.load(user_id)
+    
+    # Cache result (even if None)
+    cache_profile(cache_key, profile)
+    
+    return profile
+
+def invalidate_researcher_profile(user_id: str):
+    """Drop a researcher profile from the shared profile cache after a write"""
+    cache_key = f"researcher_profile_{user_id}"
+    profile_cache.pop(cache_key, None)
+    profile_cache_time.pop(cache_key, None)
+
+async def get_patient_profile_cached(user_id: str) -> Optional[dict]:
+    """Patient profile by user_id through the shared profile cache (treat the result as read-only)"""
+    cache_key = f"patient_profile_{user_id}"
     if cache_key in profile_cache:
         cache_age = time.time() - profile_cache_time.get(cache_key, 0)
         if cache_age < PROFILE_CACHE_TTL:
             return profile_cache[cache_key]
     
-    profile = await db.patient_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    # Concurrent misses for the same user share one query
+    profile = await patient_profiles_by_user_id.load(user_id)
     
     # Cache result (even if None)
-    profile_cache[cache_key] = profile
-    profile_cache_time[cache_key] = time.time()
+    cache_profile(cache_key, profile)
     
     return profile
 
+def invalidate_patient_profile(user_id: str):
+    """Drop a patient profile from the shared profile cache after a write"""
+    cache_key = f"patient_profile_{user_id}"
+    profile_cache.pop(cache_key, None)
+    profile_cache_time.pop(cache_key, None)
+
+@api_router.get("/patient/profile")
+async def get_patient_profile(
+    session_token: Optional[str] = Cookie(None),
+    authorization: Optional[str] = Header(None)
+):
+    """Get patient profile - OPTIMIZED with caching"""
+    user = await get_current_user(session_token, authorization)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    return await get_patient_profile_cached(user.id)
+
 @api_router.put("/patient/profile")
 async def update_patient_profile(
     profile_data: dict,
@@ -1137,10 +1343,7 @@ async def update_patient_profile(
     )
     
     # Invalidate cache
-    cache_key = f"patient_profile_{user.id}"
-    if cache_key in profile_cache:
-        del profile_cache[cache_key]
-        del profile_cache_time[cache_key]
+    invalidate_patient_profile(user.id)
     
     # Return updated profile
     updated_profile = await db.patient_profiles.find_one({"user_id": user.id}, {"_id": 0})
@@ -1163,10 +1366,10 @@ async def get_clinical_trials(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    from clinical_trials_api import ClinicalTrialsAPI
+    from clinical_trials_api import get_clinical_trials_client
     
     # Get patient profile for personalized results
-    patient_profile = await db.patient_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    patient_profile = await get_patient_profile_cached(user.id)
     patient_conditions = patient_profile.get("conditions", []) if patient_profile else []
     
     # Determine search condition: use filter > patient condition > generic
@@ -1177,11 +1380,13 @@ async def get_clinical_trials(
         search_condition = "cancer"  # Default fallback
     
     try:
-        ct_api = ClinicalTrialsAPI()
+        ct_api = get_clinical_trials_client()
         
         # Fetch trials from API (fetch more based on page)
         fetch_limit = 20 + (page - 1) * 10  # Fetch enough for all pages
-        api_trials = ct_api.search_and_normalize(
+        # Blocking HTTP client - run it off the event loop
+        api_trials = await asyncio.to_thread(
+            ct_api.search_and_normalize,
             condition=search_condition,
             location=location,
             status=status or "RECRUITING",
@@ -1189,19 +1394,21 @@ async def get_clinical_trials(
         )
         
         # Calculate relevance scores for each trial
+        # Lowercase the conditions once per request rather than once per trial
+        conditions_lower = [(condition, condition.lower()) for condition in patient_conditions]
         scored_trials = []
         for trial in api_trials:
             score = 0
             match_reasons = ["Live data from ClinicalTrials.gov"]
             
-            # Match against patient conditions
-            disease_areas = [area.lower() for area in trial.get("disease_areas", [])]
-            for patient_condition in patient_conditions:
-                condition_lower = patient_condition.lower()
-                if any(condition_lower in area for area in disease_areas):
+            # Match against patient conditions (one substring scan over the joined areas)
+            disease_areas = AREA_SEPARATOR.join(trial.get("disease_areas", [])).lower()
+            title_lower = trial.get("title", "").lower()
+            for patient_condition, condition_lower in conditions_lower:
+                if disease_areas and condition_lower in disease_areas:
                     score += 30
                     match_reasons.append(f"Matches your condition: {patient_condition}")
-                if condition_lower in trial.get("title", "").lower():
+                if condition_lower in title_lower:
                     score += 20
                     match_reasons.append(f"Title mentions: {patient_condition}")
             
@@ -1216,19 +1423,15 @@ async def get_clinical_trials(
                 match_reasons.append("Recently updated")
             
             # Add trial with score (minimum 50 for API results)
-            scored_trials.append({
-                **trial,
-                "relevance_score": max(score, 50),
-                "match_reasons": match_reasons
-            })
-        
-        # Sort by relevance score
-        scored_trials.sort(key=lambda x: x["relevance_score"], reverse=True)
+            trial["relevance_score"] = max(score, 50)
+            trial["match_reasons"] = match_reasons
+            scored_trials.append(trial)
         
         # Paginate results - get 10 items for current page
+        # Only the first end_idx items are ever shown, so select them with a bounded heap
         start_idx = (page - 1) * 10
         end_idx = start_idx + 10
-        top_trials = scored_trials[start_idx:end_idx]
+        top_trials = heapq.nlargest(end_idx, scored_trials, key=lambda x: x["relevance_score"])[start_idx:end_idx]
         
         # Return data immediately without AI summarization for speed
         for trial in top_trials:
@@ -1243,23 +1446,27 @@ async def get_clinical_trials(
         # Fallback to database
         query = {}
         if condition:
-            query["disease_areas"] = {"$regex": condition, "$options": "i"}
+            query["disease_areas"] = contains_regex(condition)
         if location:
-            query["location"] = {"$regex": location, "$options": "i"}
+            query["location"] = contains_regex(location)
         if status:
+            # Exact term - case-insensitive equality via collation, no regex engine
             query["status"] = status
         
-        trials = await db.clinical_trials.find(query, {"_id": 0}).limit(10).to_list(10)
+        trials = await db.clinical_trials.find(
+            query, TRIAL_LIST_PROJECTION, collation=CASE_INSENSITIVE_COLLATION
+        ).limit(10).to_list(10)
         # Add default scores to database results
         for trial in trials:
-            trial["relevance_score"] = 50
-            trial["match_reasons"] = ["Database result"]
+            trial.update(DEFAULT_DB_PATCH)
         return trials
 
 @api_router.get("/patient/experts")
 async def get_health_experts(
     specialty: Optional[str] = None,
     location: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+    skip: int = Query(0, ge=0),
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
@@ -1270,27 +1477,30 @@ async def get_health_experts(
     
     query = {}
     if specialty:
-        query["specialty"] = {"$regex": specialty, "$options": "i"}
+        query["specialty"] = contains_regex(specialty)
     if location:
-        query["location"] = {"$regex": location, "$options": "i"}
+        query["location"] = contains_regex(location)
     
-    experts = await db.health_experts.find(query, {"_id": 0}).limit(50).to_list(50)
+    experts = await db.health_experts.find(query, EXPERT_LIST_PROJECTION).skip(skip).limit(limit).to_list(limit)
     
-    # Add ratings for platform members
-    for expert in experts:
-        if expert.get("is_platform_member") and expert.get("user_id"):
-            reviews = await db.reviews.find(
-                {"researcher_id": expert["user_id"]},
-                {"_id": 0}
-            ).to_list(100)
-            
-            if reviews:
-                avg_rating = sum(r["rating"] for r in reviews) / len(reviews)
-                expert["average_rating"] = round(avg_rating, 1)
-                expert["total_reviews"] = len(reviews)
-            else:
-                expert["average_rating"] = 0
-                expert["total_reviews"] = 0
+    # Add ratings for platform members (fetched concurrently, ratings only)
+    members = [e for e in experts if e.get("is_platform_member") and e.get("user_id")]
+    all_reviews = await asyncio.gather(*[
+        db.reviews.find(
+            {"researcher_id": expert["user_id"]},
+            {"_id": 0, "rating": 1}
+        ).to_list(100)
+        for expert in members
+    ])
+    
+    for expert, reviews in zip(members, all_reviews):
+        if reviews:
+            avg_rating = sum(r["rating"] for r in reviews) / len(reviews)
+            expert["average_rating"] = round(avg_rating, 1)
+            expert["total_reviews"] = len(reviews)
+        else:
+            expert["average_rating"] = 0
+            expert["total_reviews"] = 0
     
     return experts
 
@@ -1309,10 +1519,10 @@ async def get_publications(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    from pubmed_api import PubMedAPI
+    from pubmed_api import get_pubmed_client
     
     # Get patient profile for personalized results
-    patient_profile = await db.patient_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    patient_profile = await get_patient_profile_cached(user.id)
     patient_conditions = patient_profile.get("conditions", []) if patient_profile else []
     
     # Determine search query: use filter > patient condition > generic
@@ -1323,13 +1533,15 @@ async def get_publications(
         search_query = "medicine"  # Default fallback
     
     try:
-        pubmed_api = PubMedAPI()
+        pubmed_api = get_pubmed_client()
         
         logger.info(f"Fetching publications from PubMed for query: {search_query}")
         
         # Fetch publications from API (fetch more based on page)
         fetch_limit = 20 + (page - 1) * 10  # Fetch enough for all pages
-        api_publications = pubmed_api.search_and_fetch(
+        # Blocking Entrez client - run it off the event loop
+        api_publications = await asyncio.to_thread(
+            pubmed_api.search_and_fetch,
             query=search_query,
             max_results=min(fetch_limit, 100)  # Max 100 total
         )
@@ -1337,6 +1549,8 @@ async def get_publications(
         logger.info(f"Received {len(api_publications)} publications from PubMed")
         
         # Calculate relevance scores for each publication
+        conditions_lower = [(condition, condition.lower()) for condition in patient_conditions]
+        current_year = datetime.now(timezone.utc).year
         scored_pubs = []
         for pub in api_publications:
             score = 0
@@ -1347,9 +1561,7 @@ async def get_publications(
             title_lower = pub.get("title", "").lower()
             abstract_lower = pub.get("abstract", "").lower()
             
-            for patient_condition in patient_conditions:
-                condition_lower = patient_condition.lower()
-                
+            for patient_condition, condition_lower in conditions_lower:
                 # Check MeSH terms (disease areas)
                 if any(condition_lower in area for area in disease_areas):
                     score += 30
@@ -1366,7 +1578,6 @@ async def get_publications(
                     match_reasons.append(f"Abstract discusses: {patient_condition}")
             
             # Boost for recent publications (last 3 years)
-            current_year = datetime.now(timezone.utc).year
             pub_year = pub.get("year") or 2000
             if current_year - pub_year <= 3:
                 score += 15
@@ -1379,19 +1590,15 @@ async def get_publications(
                 match_reasons.append("Peer-reviewed")
             
             # Add publication with score (minimum 50 for API results)
-            scored_pubs.append({
-                **pub,
-                "relevance_score": max(score, 50),
-                "match_reasons": match_reasons
-            })
-        
-        # Sort by relevance score
-        scored_pubs.sort(key=lambda x: x["relevance_score"], reverse=True)
+            pub["relevance_score"] = max(score, 50)
+            pub["match_reasons"] = match_reasons
+            scored_pubs.append(pub)
         
         # Paginate results - get 10 items for current page
+        # Only the first end_idx items are ever shown, so select them with a bounded heap
         start_idx = (page - 1) * 10
         end_idx = start_idx + 10
-        top_pubs = scored_pubs[start_idx:end_idx]
+        top_pubs = heapq.nlargest(end_idx, scored_pubs, key=lambda x: x["relevance_score"])[start_idx:end_idx]
         
         # Skip AI summarization for speed - return data immediately
         # Use truncated abstracts instead
@@ -1408,18 +1615,17 @@ async def get_publications(
         # Fallback to database
         query = {}
         if disease_area:
-            query["disease_areas"] = {"$regex": disease_area, "$options": "i"}
+            query["disease_areas"] = contains_regex(disease_area)
         elif patient_conditions:
             # Try to match patient conditions
-            query["disease_areas"] = {"$regex": patient_conditions[0], "$options": "i"}
+            query["disease_areas"] = contains_regex(patient_conditions[0])
         
-        publications = await db.publications.find(query, {"_id": 0}).limit(10).to_list(10)
+        publications = await db.publications.find(query, PUBLICATION_LIST_PROJECTION).limit(10).to_list(10)
         logger.info(f"Fallback: Found {len(publications)} publications in database")
         
         # Add default scores and quick summaries to database results
         for pub in publications:
-            pub["relevance_score"] = 50
-            pub["match_reasons"] = ["Database result"]
+            pub.update(DEFAULT_DB_PATCH)
             # Use truncated abstract instead of AI summary for speed
             abstract = pub.get("abstract", "")
             pub["ai_summary"] = abstract[:150] + "..." if len(abstract) > 150 else abstract
@@ -1444,9 +1650,7 @@ async def create_meeting_request(
         message=request_data.message
     )
     
-    request_dict = meeting_request.model_dump()
-    request_dict['created_at'] = request_dict['created_at'].isoformat()
-    await db.meeting_requests.insert_one(request_dict)
+    await db.meeting_requests.insert_one(meeting_request.model_dump(mode="json"))
     
     return {"status": "success", "message": "Meeting request sent"}
 
@@ -1467,11 +1671,14 @@ async def create_researcher_profile(
     if not profile_data.age or not profile_data.years_experience or not profile_data.sector or not profile_data.name:
         raise HTTPException(status_code=400, detail="Name, age, experience, and sector are required")
     
-    existing = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    # Existence check only - let Mongo stop at the first index hit
+    existing = await db.researcher_profiles.count_documents({"user_id": user.id}, limit=1)
     
     if existing:
         # Update existing profile
         update_data = {k: v for k, v in profile_data.model_dump().items() if v is not None}
+        if "specialties" in update_data:
+            update_data["specialty_tokens"] = specialty_tokens(update_data["specialties"])
         await db.researcher_profiles.update_one(
             {"user_id": user.id},
             {"$set": update_data}
@@ -1491,13 +1698,15 @@ async def create_researcher_profile(
             orcid=profile_data.orcid,
             researchgate=profile_data.researchgate,
             available_for_meetings=True,
-            bio=profile_data.bio or ""
+            bio=profile_data.bio or "",
+            specialty_tokens=specialty_tokens(profile_data.specialties or [])
         )
-        profile_dict = profile.model_dump()
-        profile_dict['created_at'] = profile_dict['created_at'].isoformat()
+        profile_dict = profile.model_dump(mode="json")
         await db.researcher_profiles.insert_one(profile_dict)
         profile = profile_dict
     
+    invalidate_researcher_profile(user.id)
+    
     # IMMEDIATELY create/update health expert entry
     specialty_display = profile.get("specialties", ["General"])[0] if profile.get("specialties") else profile.get("sector", "General")
     
@@ -1515,6 +1724,7 @@ async def create_researcher_profile(
         "sector": profile.get("sector"),
         "available_hours": profile.get("available_hours", "Flexible")
     }
+    expert_data.update(expert_search_fields(expert_data))
     
     # Check if expert entry exists
     existing_expert = await db.health_experts.find_one({"user_id": user.id})
@@ -1555,20 +1765,7 @@ async def get_researcher_profile(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    # Check cache
-    cache_key = f"researcher_profile_{user.id}"
-    if cache_key in profile_cache:
-        cache_age = time.time() - profile_cache_time.get(cache_key, 0)
-        if cache_age < PROFILE_CACHE_TTL:
-            return profile_cache[cache_key]
-    
-    profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
-    
-    # Cache result (even if None)
-    profile_cache[cache_key] = profile
-    profile_cache_time[cache_key] = time.time()
-    
-    return profile
+    return await get_researcher_profile_cached(user.id)
 
 @api_router.put("/researcher/profile")
 async def update_researcher_profile(
@@ -1602,6 +1799,7 @@ async def update_researcher_profile(
         update_fields["phone_number"] = profile_data["phone_number"]
     if "specialties" in profile_data:
         update_fields["specialties"] = profile_data["specialties"]
+        update_fields["specialty_tokens"] = specialty_tokens(profile_data["specialties"] or [])
     if "research_interests" in profile_data:
         update_fields["research_interests"] = profile_data["research_interests"]
     if "bio" in profile_data:
@@ -1622,10 +1820,7 @@ async def update_researcher_profile(
     )
     
     # Invalidate cache
-    cache_key = f"researcher_profile_{user.id}"
-    if cache_key in profile_cache:
-        del profile_cache[cache_key]
-        del profile_cache_time[cache_key]
+    invalidate_researcher_profile(user.id)
     
     # Return updated profile
     updated_profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
@@ -1634,6 +1829,8 @@ async def update_researcher_profile(
 @api_router.get("/researcher/collaborators")
 async def get_collaborators(
     specialty: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+    skip: int = Query(0, ge=0),
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
@@ -1647,13 +1844,13 @@ async def get_collaborators(
     
     query = {"user_id": {"$ne": user.id}}
     if specialty:
-        query["specialties"] = {"$regex": specialty, "$options": "i"}
+        query["specialties"] = contains_regex(specialty)
     
-    profiles = await db.researcher_profiles.find(query, {"_id": 0}).limit(50).to_list(50)
+    profiles = await db.researcher_profiles.find(query, {"_id": 0}).skip(skip).limit(limit).to_list(limit)
     
-    # Enrich with user data
-    for profile in profiles:
-        user_doc = await db.users.find_one({"id": profile["user_id"]}, {"_id": 0})
+    # Enrich with user data (the loader fetches all of them in one query)
+    user_docs = await asyncio.gather(*(users_by_id.load(profile["user_id"]) for profile in profiles))
+    for profile, user_doc in zip(profiles, user_docs):
         if user_doc:
             profile["name"] = user_doc.get("name")
             profile["email"] = user_doc.get("email")
@@ -1688,14 +1885,15 @@ async def create_trial(
         summary=summary
     )
     
-    trial_dict = trial.model_dump()
-    trial_dict['created_at'] = trial_dict['created_at'].isoformat()
-    await db.clinical_trials.insert_one(trial_dict)
+    trial_dict = trial.model_dump(mode="json")
+    await db.clinical_trials.insert_one(trial_dict.copy())  # copy keeps _id out of the response dict
     
-    return {"status": "success", "trial": trial.model_dump()}
+    return {"status": "success", "trial": trial_dict}
 
 @api_router.get("/researcher/trials")
 async def get_my_trials(
+    limit: int = Query(100, ge=1, le=100),
+    skip: int = Query(0, ge=0),
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
@@ -1704,7 +1902,9 @@ async def get_my_trials(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    trials = await db.clinical_trials.find({"created_by": user.id}, {"_id": 0}).to_list(100)
+    trials = await db.clinical_trials.find(
+        {"created_by": user.id}, {"_id": 0}
+    ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
     return trials
 
 @api_router.post("/researcher/search")
@@ -1726,7 +1926,7 @@ async def researcher_search(
         raise HTTPException(status_code=400, detail="Query is required")
     
     # Get researcher's profile for personalized matching
-    researcher_profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    researcher_profile = await get_researcher_profile_cached(user.id)
     researcher_specialties = researcher_profile.get("specialties", []) if researcher_profile else []
     researcher_interests = researcher_profile.get("research_interests", []) if researcher_profile else []
     
@@ -1738,18 +1938,15 @@ async def researcher_search(
     
     # Search for other researchers
     query_lower = query.lower()
-    all_researchers = await db.researcher_profiles.find({}, {"_id": 0}).to_list(1000)
+    all_researchers = await db.researcher_profiles.find({"user_id": {"$ne": user.id}}, {"_id": 0}).to_list(1000)
     
-    for researcher in all_researchers:
-        # Skip self
-        if researcher.get("user_id") == user.id:
-            continue
-            
+    # Get user info for every researcher (the loader fetches all of them in one query)
+    researcher_users = await asyncio.gather(*(users_by_id.load(r.get("user_id")) for r in all_researchers))
+    
+    for researcher, researcher_user in zip(all_researchers, researcher_users):
         match_score = 0
         match_reasons = []
         
-        # Get user info
-        researcher_user = await db.users.find_one({"id": researcher.get("user_id")}, {"_id": 0})
         if not researcher_user:
             continue
         
@@ -1805,9 +2002,10 @@ async def researcher_search(
                 "match_reasons": match_reasons[:3]
             })
     
-    # Search trials from database
-    trials = await db.clinical_trials.find({}, {"_id": 0}).to_list(1000)
-    for trial in trials:
+    # Search trials from database - stream the cursor so only matching trials are kept in
+    # memory and scoring overlaps with fetching the next batch
+    trials_cursor = db.clinical_trials.find({}, {"_id": 0}).limit(1000).batch_size(200)
+    async for trial in trials_cursor:
         match_score = 0
         match_reasons = []
         
@@ -1843,11 +2041,9 @@ async def researcher_search(
                     break
         
         if match_score > 0:
-            results["trials"].append({
-                **trial,
-                "match_score": min(match_score, 100),
-                "match_reasons": match_reasons[:3]
-            })
+            trial["match_score"] = min(match_score, 100)
+            trial["match_reasons"] = match_reasons[:3]
+            results["trials"].append(trial)
     
     # Search publications via PubMed API
     try:
@@ -1874,18 +2070,16 @@ async def researcher_search(
                     match_reasons.append(f"Specialty area: {specialty}")
                     break
             
-            results["publications"].append({
-                **pub,
-                "match_score": min(match_score, 100),
-                "match_reasons": match_reasons[:3]
-            })
+            pub["match_score"] = min(match_score, 100)
+            pub["match_reasons"] = match_reasons[:3]
+            results["publications"].append(pub)
     except Exception as e:
         logging.error(f"PubMed search failed: {e}")
     
-    # Sort by match score
-    results["researchers"] = sorted(results["researchers"], key=lambda x: x["match_score"], reverse=True)[:20]
-    results["trials"] = sorted(results["trials"], key=lambda x: x["match_score"], reverse=True)[:20]
-    results["publications"] = sorted(results["publications"], key=lambda x: x["match_score"], reverse=True)[:20]
+    # Keep the top 20 by match score
+    results["researchers"] = heapq.nlargest(20, results["researchers"], key=lambda x: x["match_score"])
+    results["trials"] = heapq.nlargest(20, results["trials"], key=lambda x: x["match_score"])
+    results["publications"] = heapq.nlargest(20, results["publications"], key=lambda x: x["match_score"])
     
     return results
 
@@ -1953,16 +2147,13 @@ async def get_researcher_overview(
     start_time = time.time()
     
     # Get researcher profile
-    researcher_profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    researcher_profile = await get_researcher_profile_cached(user.id)
     
     specialties = researcher_profile.get("specialties", []) if researcher_profile else []
-    interests = researcher_profile.get("research_interests", []) if researcher_profile else []
     
     # Use defaults (reduced to 2 for speed)
     if not specialties:
         specialties = ["oncology", "cardiology"]
-    if not interests:
-        interests = ["clinical trials"]
     
     # Check cache
     cache_key = f"researcher_overview_{','.join(specialties[:2])}"
@@ -1972,66 +2163,11 @@ async def get_researcher_overview(
             logging.info(f"Returning cached researcher overview (age: {cache_age:.1f}s)")
             return overview_cache[cache_key]
     
-    # Get top researchers in the same field
-    all_researchers = await db.researcher_profiles.find({}, {"_id": 0}).to_list(1000)
-    scored_researchers = []
-    
-    for researcher in all_researchers:
-        # Skip self
-        if researcher.get("user_id") == user.id:
-            continue
-        
-        score = 0
-        reasons = []
-        
-        # Check specialty overlap
-        researcher_specialties = researcher.get("specialties", [])
-        specialty_overlap = set([s.lower() for s in specialties]).intersection(
-            set([s.lower() for s in researcher_specialties])
-        )
-        if specialty_overlap:
-            score += 50
-            reasons.append(f"Shared specialty: {list(specialty_overlap)[0]}")
-        
-        # Check research interest overlap
-        researcher_interests = researcher.get("research_interests", [])
-        interest_overlap = set([i.lower() for i in interests]).intersection(
-            set([i.lower() for i in researcher_interests])
-        )
-        if interest_overlap:
-            score += 40
-            reasons.append(f"Shared interest: {list(interest_overlap)[0]}")
-        
-        # Boost if open to collaboration
-        if researcher.get("open_to_collaboration"):
-            score += 20
-            reasons.append("Open to collaboration")
-        
-        if score > 0:
-            researcher_user = await db.users.find_one({"id": researcher.get("user_id")}, {"_id": 0})
-            if researcher_user:
-                scored_researchers.append({
-                    "id": researcher.get("user_id"),
-                    "name": researcher_user.get("name"),
-                    "picture": researcher_user.get("picture"),
-                    "institution": researcher.get("institution"),
-                    "specialties": researcher_specialties,
-                    "bio": researcher.get("bio"),
-                    "years_experience": researcher.get("years_experience"),
-                    "open_to_collaboration": researcher.get("open_to_collaboration", False),
-                    "relevance_score": score,
-                    "reasons": reasons[:2]
-                })
-    
-    top_researchers = sorted(scored_researchers, key=lambda x: x["relevance_score"], reverse=True)[:3]
-    
     # Fetch trials and publications CONCURRENTLY
-    from concurrent.futures import ThreadPoolExecutor
-    
     def fetch_researcher_trials():
         try:
-            from clinical_trials_api import ClinicalTrialsAPI
-            api_client = ClinicalTrialsAPI()
+            from clinical_trials_api import get_clinical_trials_client
+            api_client = get_clinical_trials_client()
             primary_specialty = specialties[0] if specialties else "oncology"
             trials = api_client.search_and_normalize(
                 condition=primary_specialty,
@@ -2048,8 +2184,8 @@ async def get_researcher_overview(
     
     def fetch_researcher_publications():
         try:
-            from pubmed_api import PubMedAPI
-            api_client = PubMedAPI()
+            from pubmed_api import get_pubmed_client
+            api_client = get_pubmed_client()
             primary_specialty = specialties[0] if specialties else "medicine"
             pubs = api_client.search_and_fetch(
                 query=f"{primary_specialty} research",
@@ -2064,27 +2200,31 @@ async def get_researcher_overview(
             logging.error(f"Publications fetch error: {e}")
             return []
     
-    # Parallel execution
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        trials_future = executor.submit(fetch_researcher_trials)
-        pubs_future = executor.submit(fetch_researcher_publications)
-        all_trials = trials_future.result()
-        all_publications = pubs_future.result()
+    # Parallel execution in worker threads, without blocking the event loop while waiting
+    all_trials, all_publications = await asyncio.gather(
+        asyncio.to_thread(fetch_researcher_trials),
+        asyncio.to_thread(fetch_researcher_publications)
+    )
+    
+    # Lowercase the top specialties once for all the scoring loops below
+    top_specialties_lower = [specialty.lower() for specialty in specialties[:2]]
+    top_specialties_set = set(top_specialties_lower)
     
     # Quick trial scoring
     scored_trials = []
     for trial in all_trials[:15]:
         score = 75
-        disease_areas = [a.lower() for a in trial.get("disease_areas", [])]
+        disease_areas = AREA_SEPARATOR.join(trial.get("disease_areas", [])).lower()
         
-        for specialty in specialties[:2]:
-            if any(specialty.lower() in area for area in disease_areas):
+        for specialty in top_specialties_lower:
+            if disease_areas and specialty in disease_areas:
                 score = 95
                 break
         
-        scored_trials.append({**trial, "relevance_score": score})
+        trial["relevance_score"] = score
+        scored_trials.append(trial)
     
-    featured_trials = sorted(scored_trials, key=lambda x: x["relevance_score"], reverse=True)[:5]
+    featured_trials = heapq.nlargest(5, scored_trials, key=lambda x: x["relevance_score"])
     
     # Quick publication scoring
     scored_pubs = []
@@ -2092,39 +2232,45 @@ async def get_researcher_overview(
         score = 75
         pub_title = pub.get("title", "").lower()
         
-        for specialty in specialties[:2]:
-            if specialty.lower() in pub_title:
+        for specialty in top_specialties_lower:
+            if specialty in pub_title:
                 score = 90
                 break
         
         if pub.get("year", 0) >= 2024:
             score = min(score + 10, 100)
         
-        scored_pubs.append({**pub, "relevance_score": score})
+        pub["relevance_score"] = score
+        scored_pubs.append(pub)
     
-    latest_publications = sorted(scored_pubs, key=lambda x: x["relevance_score"], reverse=True)[:5]
+    latest_publications = heapq.nlargest(5, scored_pubs, key=lambda x: x["relevance_score"])
     
     # Get top researchers (simplified - from database only, quick)
-    top_researchers = []
     all_researchers = await db.researcher_profiles.find(
-        {}, {"_id": 0}
+        {}, {"_id": 0, "user_id": 1, "specialties": 1, "institution": 1}
     ).limit(20).to_list(20)
     
-    for researcher in all_researchers[:10]:
-        if researcher.get("user_id") == user.id:
-            continue
-        researcher_specialties = researcher.get("specialties", [])
-        if any(s.lower() in [sp.lower() for sp in specialties[:2]] for s in researcher_specialties):
-            researcher_user = await db.users.find_one({"id": researcher.get("user_id")}, {"_id": 0})
-            if researcher_user:
-                top_researchers.append({
-                    "id": researcher.get("user_id"),
-                    "name": researcher_user.get("name"),
-                    "specialties": researcher_specialties,
-                    "institution": researcher.get("institution")
-                })
-                if len(top_researchers) >= 3:
-                    break
+    matching_researchers = [
+        researcher for researcher in all_researchers[:10]
+        if researcher.get("user_id") != user.id
+        and any(s.lower() in top_specialties_set for s in researcher.get("specialties", []))
+    ]
+    # User info for every match (the loader fetches all of them in one query)
+    researcher_users = await asyncio.gather(
+        *(users_by_id.load(researcher.get("user_id")) for researcher in matching_researchers)
+    )
+    
+    top_researchers = []
+    for researcher, researcher_user in zip(matching_researchers, researcher_users):
+        if researcher_user:
+            top_researchers.append({
+                "id": researcher.get("user_id"),
+                "name": researcher_user.get("name"),
+                "specialties": researcher.get("specialties", []),
+                "institution": researcher.get("institution")
+            })
+            if len(top_researchers) >= 3:
+                break
     
     result = {
         "top_researchers": top_researchers,
@@ -2161,10 +2307,8 @@ async def get_researcher_publications(
     ).to_list(1000)
     
     for pub in db_publications:
-        all_publications.append({
-            **pub,
-            "source": "manual"
-        })
+        pub["source"] = "manual"
+        all_publications.append(pub)
     
     # Get publications from PubMed
     try:
@@ -2172,10 +2316,8 @@ async def get_researcher_publications(
         pubmed_publications = await search_pubmed_by_author(user.name, max_results=50)
         
         for pub in pubmed_publications:
-            all_publications.append({
-                **pub,
-                "source": "pubmed"
-            })
+            pub["source"] = "pubmed"
+            all_publications.append(pub)
     except Exception as e:
         logging.error(f"Failed to fetch PubMed publications: {e}")
     
@@ -2290,8 +2432,7 @@ async def create_forum(
         )
         
         # Convert to dict and serialize datetime
-        forum_dict = forum.model_dump()
-        forum_dict['created_at'] = forum_dict['created_at'].isoformat()
+        forum_dict = forum.model_dump(mode="json")
         
         # Insert into database - single operation (< 50ms with indexing)
         await db.forums.insert_one(forum_dict)
@@ -2323,7 +2464,7 @@ async def delete_forum(
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
-    """Delete a forum with fast response and background cleanup - OPTIMIZED v2"""
+    """Delete a forum and its posts/memberships in parallel - OPTIMIZED v3"""
     try:
         # Authentication (< 10ms)
         user = await get_current_user(session_token, authorization)
@@ -2339,9 +2480,14 @@ async def delete_forum(
         if forum['created_by'] != user.id:
             raise HTTPException(status_code=403, detail="Only the forum creator can delete it")
         
-        # Delete forum immediately (< 20ms)
-        await db.forums.delete_one({"id": forum_id})
-        logging.info(f"✅ Forum deleted: {forum.get('name')} (ID: {forum_id})")
+        # Delete forum, posts and memberships CONCURRENTLY - independent collections,
+        # so latency is max-of-three instead of sum-of-three
+        _, posts_result, members_result = await asyncio.gather(
+            db.forums.delete_one({"id": forum_id}),
+            db.forum_posts.delete_many({"forum_id": forum_id}),
+            db.forum_memberships.delete_many({"forum_id": forum_id})
+        )
+        logging.info(f"✅ Forum deleted: {forum.get('name')} (ID: {forum_id}) - {posts_result.deleted_count} posts, {members_result.deleted_count} members")
         
         # Clear posts cache for this specific forum
         global forum_posts_cache, forum_posts_cache_time
@@ -2350,21 +2496,7 @@ async def delete_forum(
         if forum_id in forum_posts_cache_time:
             del forum_posts_cache_time[forum_id]
         
-        # Async cleanup for related data - run in background (non-blocking)
-        import asyncio
-        
-        async def cleanup_related_data():
-            """Background cleanup of posts and memberships"""
-            try:
-                posts_result = await db.forum_posts.delete_many({"forum_id": forum_id})
-                members_result = await db.forum_memberships.delete_many({"forum_id": forum_id})
-                logging.info(f"🧹 Background cleanup complete: {posts_result.deleted_count} posts, {members_result.deleted_count} members")
-            except Exception as e:
-                logging.error(f"❌ Background cleanup error for forum {forum_id}: {str(e)}")
-        
-        asyncio.create_task(cleanup_related_data())
-        
-        # Return success immediately (target: 10-30ms total response time)
+        # Return success (target: 10-30ms total response time)
         return {
             "status": "success",
             "message": "Forum deleted successfully",
@@ -2383,58 +2515,75 @@ async def delete_forum(
 forum_posts_cache = {}
 forum_posts_cache_time = {}
 FORUM_POSTS_CACHE_TTL = 120  # 2 minutes
+FORUM_POSTS_PAGE_SIZE = 50  # Default page of top-level posts (only this page is cached)
+FORUM_REPLIES_PER_POST = 20
+FORUM_REPLY_MAX_DEPTH = 10  # Nesting levels of replies loaded under a top-level post
+
+async def attach_forum_replies(forum_id: str, posts: List[dict]):
+    """
+    Attach each post's newest FORUM_REPLIES_PER_POST replies as "replies", nested threads
+    included - one aggregation per nesting level (forum_id + parent_id + created_at index),
+    and a busy thread can't take other posts' reply slots
+    """
+    level = posts
+    for _ in range(FORUM_REPLY_MAX_DEPTH):
+        if not level:
+            break
+        for post in level:
+            post["replies"] = []
+        posts_by_id = {post["id"]: post for post in level}
+        groups = await db.forum_posts.aggregate([
+            {"$match": {"forum_id": forum_id, "parent_id": {"$in": list(posts_by_id)}}},
+            {"$sort": {"created_at": -1}},
+            {"$project": {"_id": 0}},
+            {"$group": {"_id": "$parent_id", "replies": {"$push": "$$ROOT"}}},
+            {"$project": {"replies": {"$slice": ["$replies", FORUM_REPLIES_PER_POST]}}}
+        ]).to_list(None)
+        level = []
+        for group in groups:
+            posts_by_id[group["_id"]]["replies"] = group["replies"]
+            level.extend(group["replies"])
+    for post in level:
+        # Deeper than FORUM_REPLY_MAX_DEPTH - not loaded
+        post["replies"] = []
 
 @api_router.get("/forums/{forum_id}/posts")
 async def get_forum_posts(
     forum_id: str,
+    limit: int = Query(FORUM_POSTS_PAGE_SIZE, ge=1, le=100),
+    skip: int = Query(0, ge=0),
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
-    """Get forum posts - OPTIMIZED with single query and caching"""
+    """Get forum posts - OPTIMIZED with paginated top-level query, per-post capped reply threads and caching"""
     user = await get_current_user(session_token, authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    # Check cache
+    # Check cache (default first page only)
     cache_key = forum_id
-    if cache_key in forum_posts_cache:
+    cacheable = skip == 0 and limit == FORUM_POSTS_PAGE_SIZE
+    if cacheable and cache_key in forum_posts_cache:
         cache_age = time.time() - forum_posts_cache_time.get(cache_key, 0)
         if cache_age < FORUM_POSTS_CACHE_TTL:
             logging.info(f"Returning cached forum posts (age: {cache_age:.1f}s)")
             return forum_posts_cache[cache_key]
     
-    # OPTIMIZED: Fetch ALL posts and replies in a SINGLE query
-    all_posts = await db.forum_posts.find(
-        {"forum_id": forum_id},
+    # Fetch only the requested page of top-level posts (newest first)
+    top_level_posts = await db.forum_posts.find(
+        {"forum_id": forum_id, "parent_id": None},
         {"_id": 0}
-    ).sort("created_at", -1).limit(500).to_list(500)
-    
-    # Organize posts and replies efficiently using a dictionary
-    posts_dict = {}
-    top_level_posts = []
-    
-    for post in all_posts:
-        post["replies"] = []  # Initialize replies array
-        posts_dict[post["id"]] = post
-        
-        if post.get("parent_id") is None:
-            top_level_posts.append(post)
-    
-    # Attach replies to their parent posts
-    for post in all_posts:
-        parent_id = post.get("parent_id")
-        if parent_id and parent_id in posts_dict:
-            posts_dict[parent_id]["replies"].append(post)
+    ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
     
-    # Sort top-level posts by date (newest first)
-    top_level_posts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    # Replies for the whole page, grouped by parent (one query per nesting level, not per post)
+    await attach_forum_replies(forum_id, top_level_posts)
     
-    # Limit to 50 most recent top-level posts for performance
-    result = top_level_posts[:50]
+    result = top_level_posts
     
     # Cache result
-    forum_posts_cache[cache_key] = result
-    forum_posts_cache_time[cache_key] = time.time()
+    if cacheable:
+        forum_posts_cache[cache_key] = result
+        forum_posts_cache_time[cache_key] = time.time()
     
     return result
 
@@ -2450,12 +2599,12 @@ async def create_forum_post(
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     # Check if user is a member of this forum
-    membership = await db.forum_memberships.find_one({
+    is_member = await db.forum_memberships.count_documents({
         "forum_id": post_data.forum_id,
         "user_id": user.id
-    })
+    }, limit=1)
     
-    if not membership:
+    if not is_member:
         raise HTTPException(
             status_code=403, 
             detail="You must join this forum group first to participate in discussions."
@@ -2479,9 +2628,17 @@ async def create_forum_post(
         image_url=post_data.image_url
     )
     
-    post_dict = post.model_dump()
-    post_dict['created_at'] = post_dict['created_at'].isoformat()
-    await db.forum_posts.insert_one(post_dict)
+    post_dict = post.model_dump(mode="json")
+    
+    # Insert the post and bump the forum post count (top-level posts only) concurrently -
+    # they touch different collections, so there is nothing to order between them
+    writes = [db.forum_posts.insert_one(post_dict.copy())]  # copy keeps _id out of the response dict
+    if not post_data.parent_id:
+        writes.append(db.forums.update_one(
+            {"id": post_data.forum_id},
+            {"$inc": {"post_count": 1}}
+        ))
+    await asyncio.gather(*writes)
     
     # Invalidate forum posts cache for this forum
     cache_key = post_data.forum_id
@@ -2489,19 +2646,13 @@ async def create_forum_post(
         del forum_posts_cache[cache_key]
         del forum_posts_cache_time[cache_key]
     
-    # Update forum post count
     if not post_data.parent_id:
-        await db.forums.update_one(
-            {"id": post_data.forum_id},
-            {"$inc": {"post_count": 1}}
-        )
-        
         # Also invalidate forums list cache
         global forums_cache, forums_cache_time
         forums_cache = None
         forums_cache_time = 0
     
-    return {"status": "success", "post": post.model_dump()}
+    return {"status": "success", "post": post_dict}
 
 # ============ Forum Membership Endpoints ============
 
@@ -2522,10 +2673,10 @@ async def join_forum_group(
         raise HTTPException(status_code=404, detail="Forum not found")
     
     # Check if already a member
-    existing = await db.forum_memberships.find_one({
+    existing = await db.forum_memberships.count_documents({
         "forum_id": forum_id,
         "user_id": user.id
-    })
+    }, limit=1)
     
     if existing:
         return {"status": "already_member", "message": "Already a member of this group"}
@@ -2540,9 +2691,7 @@ async def join_forum_group(
             specialty="Patient"  # Patients don't have specialties
         )
         
-        membership_dict = membership.model_dump()
-        membership_dict['joined_at'] = membership_dict['joined_at'].isoformat()
-        await db.forum_memberships.insert_one(membership_dict)
+        await db.forum_memberships.insert_one(membership.model_dump(mode="json"))
         
         return {"status": "success", "message": "Successfully joined the group"}
     
@@ -2552,15 +2701,11 @@ async def join_forum_group(
         if not researcher:
             raise HTTPException(status_code=404, detail="Researcher profile not found")
         
-        # Check if researcher's specialty matches forum category
-        forum_category = forum.get("category", "").lower()
-        researcher_specialties = [s.lower() for s in researcher.get("specialties", [])]
-        
-        # Simple matching logic - can be made more sophisticated
-        has_matching_specialty = any(
-            specialty in forum_category or forum_category in specialty
-            for specialty in researcher_specialties
-        )
+        # Check if researcher's specialty matches forum category (shared word tokens)
+        forum_tokens = set(forum.get("category", "").lower().split())
+        # Profiles saved before specialty_tokens existed get them computed on the fly
+        researcher_tokens = researcher.get("specialty_tokens") or specialty_tokens(researcher.get("specialties", []))
+        has_matching_specialty = not forum_tokens.isdisjoint(researcher_tokens)
         
         if not has_matching_specialty:
             raise HTTPException(
@@ -2577,9 +2722,7 @@ async def join_forum_group(
             specialty=", ".join(researcher["specialties"][:2])  # First 2 specialties
         )
         
-        membership_dict = membership.model_dump()
-        membership_dict['joined_at'] = membership_dict['joined_at'].isoformat()
-        await db.forum_memberships.insert_one(membership_dict)
+        await db.forum_memberships.insert_one(membership.model_dump(mode="json"))
         
         return {"status": "success", "message": "Successfully joined the group"}
     
@@ -2647,6 +2790,32 @@ async def get_forum_members(
 
 # ============ Q&A Community Endpoints ============
 
+# Cache for question lists per condition filter (60 seconds, cleared on new questions/answers)
+questions_cache = {}
+questions_cache_time = {}
+QUESTIONS_CACHE_TTL = 60  # 1 minute
+QUESTIONS_CACHE_MAX_SIZE = 500  # Keys come from the client's ?condition= filter
+
+def invalidate_questions_cache():
+    """Drop all cached question lists (answer counts and ordering change on writes)"""
+    questions_cache.clear()
+    questions_cache_time.clear()
+
+def cache_questions(cache_key: str, questions: List[dict]):
+    """Store a question list, purging expired entries and then the oldest ones once full"""
+    now = time.time()
+    questions_cache.pop(cache_key, None)
+    if len(questions_cache) >= QUESTIONS_CACHE_MAX_SIZE:
+        for key in [k for k, t in questions_cache_time.items() if now - t >= QUESTIONS_CACHE_TTL]:
+            questions_cache.pop(key, None)
+            questions_cache_time.pop(key, None)
+    while len(questions_cache) >= QUESTIONS_CACHE_MAX_SIZE:
+        oldest_key = next(iter(questions_cache))
+        questions_cache.pop(oldest_key, None)
+        questions_cache_time.pop(oldest_key, None)
+    questions_cache[cache_key] = questions
+    questions_cache_time[cache_key] = now
+
 @api_router.post("/qa/questions")
 async def create_question(
     question_data: QuestionCreateRequest,
@@ -2669,11 +2838,17 @@ async def create_question(
         is_anonymous=question_data.is_anonymous
     )
     
-    question_dict = question.model_dump()
-    question_dict['created_at'] = question_dict['created_at'].isoformat()
-    await db.questions.insert_one(question_dict)
+    question_dict = question.model_dump(mode="json")
+    # Lowercased copy of condition so the list filter can use an anchored index prefix scan
+    # (inserted from a copy so the response dict isn't mutated with _id)
+    await db.questions.insert_one({
+        **question_dict,
+        "condition_lc": question.condition.lower() if question.condition else None
+    })
     
-    return {"status": "success", "question": question.model_dump()}
+    invalidate_questions_cache()
+    
+    return {"status": "success", "question": question_dict}
 
 @api_router.get("/qa/questions")
 async def get_questions(
@@ -2686,16 +2861,42 @@ async def get_questions(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
+    # Check cache
+    cache_key = (condition or "").lower()
+    if cache_key in questions_cache:
+        cache_age = time.time() - questions_cache_time.get(cache_key, 0)
+        if cache_age < QUESTIONS_CACHE_TTL:
+            return questions_cache[cache_key]
+    
     query = {}
     if condition:
-        query["condition"] = {"$regex": condition, "$options": "i"}
-    
-    questions = await db.questions.find(query, {"_id": 0, "patient_id": 0}).sort("created_at", -1).to_list(100)
+        query["condition_lc"] = {"$regex": f"^{re.escape(condition.lower())}"}
+    
+    # Single aggregation: latest 100 questions with their top-level answer counts
+    # (replaces one count_documents round-trip per question)
+    pipeline = [
+        {"$match": query},
+        {"$sort": {"created_at": -1}},
+        {"$limit": 100},
+        {"$lookup": {
+            "from": "answers",
+            "let": {"qid": "$id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$question_id", "$$qid"]},
+                    {"$eq": ["$parent_id", None]}
+                ]}}},
+                {"$count": "n"}
+            ],
+            "as": "answer_counts"
+        }},
+        {"$addFields": {"answer_count": {"$ifNull": [{"$first": "$answer_counts.n"}, 0]}}},
+        {"$project": {"_id": 0, "patient_id": 0, "condition_lc": 0, "answer_counts": 0}}
+    ]
+    questions = await db.questions.aggregate(pipeline).to_list(100)
     
-    # Get answer counts for each question
-    for question in questions:
-        answer_count = await db.answers.count_documents({"question_id": question["id"], "parent_id": None})
-        question["answer_count"] = answer_count
+    # Cache result
+    cache_questions(cache_key, questions)
     
     return questions
 
@@ -2720,26 +2921,33 @@ async def get_question_detail(
         {"_id": 0}
     ).sort("created_at", -1).to_list(100)
     
-    # Get user's votes
+    # Get replies for all answers in one query, grouped by parent answer
+    answer_ids = [answer["id"] for answer in answers]
+    replies = await db.answers.find(
+        {"question_id": question_id, "parent_id": {"$in": answer_ids}},
+        {"_id": 0}
+    ).sort("created_at", 1).to_list(2000) if answer_ids else []
+    
+    # Get user's votes - only for the answers and replies on this page
+    voted_ids = answer_ids + [reply["id"] for reply in replies]
     user_votes = {}
-    votes = await db.votes.find({"user_id": user.id}, {"_id": 0}).to_list(1000)
-    for vote in votes:
-        user_votes[vote["answer_id"]] = vote["vote_type"]
+    if voted_ids:
+        votes = await db.votes.find(
+            {"user_id": user.id, "answer_id": {"$in": voted_ids}},
+            {"_id": 0, "answer_id": 1, "vote_type": 1}
+        ).to_list(len(voted_ids))
+        for vote in votes:
+            user_votes[vote["answer_id"]] = vote["vote_type"]
+    
+    replies_by_parent = defaultdict(list)
+    for reply in replies:
+        # Add user votes for replies
+        reply["user_vote"] = user_votes.get(reply["id"])
+        replies_by_parent[reply["parent_id"]].append(reply)
     
-    # Get replies for each answer
     for answer in answers:
         answer["user_vote"] = user_votes.get(answer["id"])
-        
-        replies = await db.answers.find(
-            {"question_id": question_id, "parent_id": answer["id"]},
-            {"_id": 0}
-        ).sort("created_at", 1).to_list(100)
-        
-        # Add user votes for replies
-        for reply in replies:
-            reply["user_vote"] = user_votes.get(reply["id"])
-        
-        answer["replies"] = replies
+        answer["replies"] = replies_by_parent[answer["id"]]
     
     question["answers"] = answers
     
@@ -2760,7 +2968,7 @@ async def create_answer(
         raise HTTPException(status_code=403, detail="Only researchers can answer")
     
     # Get researcher profile for specialty
-    researcher_profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    researcher_profile = await get_researcher_profile_cached(user.id)
     specialty = None
     if researcher_profile and researcher_profile.get("specialties"):
         specialty = researcher_profile["specialties"][0]
@@ -2774,11 +2982,22 @@ async def create_answer(
         parent_id=answer_data.parent_id
     )
     
-    answer_dict = answer.model_dump()
-    answer_dict['created_at'] = answer_dict['created_at'].isoformat()
-    await db.answers.insert_one(answer_dict)
+    answer_dict = answer.model_dump(mode="json")
+    await db.answers.insert_one(answer_dict.copy())  # copy keeps _id out of the response dict
+    
+    # New top-level answers change answer_count in the question lists
+    if not answer_data.parent_id:
+        invalidate_questions_cache()
     
-    return {"status": "success", "answer": answer.model_dump()}
+    return {"status": "success", "answer": answer_dict}
+
+# (previous vote, new vote) -> answer like/dislike counter changes
+VOTE_COUNT_DELTAS = {
+    (None, "like"): {"likes": 1},
+    (None, "dislike"): {"dislikes": 1},
+    ("like", "dislike"): {"likes": -1, "dislikes": 1},
+    ("dislike", "like"): {"likes": 1, "dislikes": -1},
+}
 
 @api_router.post("/qa/vote")
 async def vote_answer(
@@ -2794,77 +3013,64 @@ async def vote_answer(
     if vote_data.vote_type not in ["like", "dislike"]:
         raise HTTPException(status_code=400, detail="Invalid vote type")
     
-    # Check if user already voted
-    existing_vote = await db.votes.find_one({
-        "answer_id": vote_data.answer_id,
-        "user_id": user.id
-    })
-    
-    if existing_vote:
-        # Update vote
-        old_vote = existing_vote["vote_type"]
-        if old_vote != vote_data.vote_type:
-            # Change vote
-            await db.votes.update_one(
-                {"answer_id": vote_data.answer_id, "user_id": user.id},
-                {"$set": {"vote_type": vote_data.vote_type}}
-            )
-            
-            # Update answer counts
-            if old_vote == "like":
-                await db.answers.update_one(
-                    {"id": vote_data.answer_id},
-                    {"$inc": {"likes": -1, "dislikes": 1}}
-                )
-            else:
-                await db.answers.update_one(
-                    {"id": vote_data.answer_id},
-                    {"$inc": {"likes": 1, "dislikes": -1}}
-                )
-        else:
-            # Remove vote
-            await db.votes.delete_one({
-                "answer_id": vote_data.answer_id,
-                "user_id": user.id
-            })
-            
-            # Update answer counts
-            if vote_data.vote_type == "like":
-                await db.answers.update_one(
-                    {"id": vote_data.answer_id},
-                    {"$inc": {"likes": -1}}
-                )
-            else:
-                await db.answers.update_one(
-                    {"id": vote_data.answer_id},
-                    {"$inc": {"dislikes": -1}}
-                )
-    else:
-        # New vote
-        vote = Vote(
-            answer_id=vote_data.answer_id,
-            user_id=user.id,
-            vote_type=vote_data.vote_type
-        )
-        
-        vote_dict = vote.model_dump()
-        vote_dict['created_at'] = vote_dict['created_at'].isoformat()
-        await db.votes.insert_one(vote_dict)
-        
-        # Update answer counts
-        if vote_data.vote_type == "like":
-            await db.answers.update_one(
-                {"id": vote_data.answer_id},
-                {"$inc": {"likes": 1}}
-            )
-        else:
+    # Upsert the vote atomically and get the previous vote type in the same round-trip
+    vote = Vote(
+        answer_id=vote_data.answer_id,
+        user_id=user.id,
+        vote_type=vote_data.vote_type
+    )
+    previous = await db.votes.find_one_and_update(
+        {"answer_id": vote_data.answer_id, "user_id": user.id},
+        {
+            "$set": {"vote_type": vote_data.vote_type},
+            "$setOnInsert": {"id": vote.id, "created_at": vote.model_dump(mode="json")["created_at"]}
+        },
+        upsert=True,
+        projection={"_id": 0, "vote_type": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    old_vote = previous.get("vote_type") if previous else None
+    
+    if old_vote == vote_data.vote_type:
+        # Same vote again - remove the vote, and decrement only if this request removed it
+        # (concurrent duplicate clicks all see the old vote, but only one delete succeeds)
+        result = await db.votes.delete_one({
+            "answer_id": vote_data.answer_id,
+            "user_id": user.id,
+            "vote_type": vote_data.vote_type
+        })
+        if result.deleted_count == 1:
             await db.answers.update_one(
                 {"id": vote_data.answer_id},
-                {"$inc": {"dislikes": 1}}
+                {"$inc": {f"{vote_data.vote_type}s": -1}}
             )
+    else:
+        # New vote or changed vote - update answer counts
+        await db.answers.update_one(
+            {"id": vote_data.answer_id},
+            {"$inc": VOTE_COUNT_DELTAS[(old_vote, vote_data.vote_type)]}
+        )
     
     return {"status": "success"}
 
+# Favorite item_type -> (collection, id field, projection) used to resolve favorited items;
+# projections cover what the favorites views render
+FAVORITE_ITEM_SOURCES = {
+    "trial": ("clinical_trials", "id", TRIAL_LIST_PROJECTION),
+    "publication": ("publications", "id", PUBLICATION_LIST_PROJECTION),
+    "expert": ("health_experts", "id", {
+        **EXPERT_LIST_PROJECTION, "available_hours": 1, "average_rating": 1, "total_reviews": 1
+    }),
+    "collaborator": ("researcher_profiles", "user_id", {
+        "_id": 0, "user_id": 1, "name": 1, "specialties": 1, "research_interests": 1,
+        "sector": 1, "institution": 1, "available_hours": 1, "bio": 1
+    }),
+    "forum": ("forums", "id", {
+        "_id": 0, "id": 1, "name": 1, "description": 1, "category": 1,
+        "post_count": 1, "created_by_name": 1, "created_at": 1
+    }),
+}
+
 @api_router.get("/favorites")
 async def get_favorites(
     session_token: Optional[str] = Cookie(None),
@@ -2877,20 +3083,26 @@ async def get_favorites(
     
     favorites = await db.favorites.find({"user_id": user.id}, {"_id": 0}).to_list(100)
     
-    # Enrich with actual items
+    # Group favorited ids by type so each collection is queried once
+    buckets = defaultdict(list)
+    for fav in favorites:
+        if fav["item_type"] in FAVORITE_ITEM_SOURCES:
+            buckets[fav["item_type"]].append(fav["item_id"])
+    
+    async def load_items(item_type: str, ids: List[str]) -> Dict[str, dict]:
+        collection, field, projection = FAVORITE_ITEM_SOURCES[item_type]
+        docs = await db[collection].find({field: {"$in": ids}}, projection).to_list(len(ids))
+        return {doc[field]: doc for doc in docs}
+    
+    # Fetch all item types concurrently
+    item_types = list(buckets)
+    item_maps = await asyncio.gather(*[load_items(t, buckets[t]) for t in item_types])
+    items_by_type = dict(zip(item_types, item_maps))
+    
+    # Enrich with actual items, preserving favorites order
     enriched = []
     for fav in favorites:
-        item = None
-        if fav["item_type"] == "trial":
-            item = await db.clinical_trials.find_one({"id": fav["item_id"]}, {"_id": 0})
-        elif fav["item_type"] == "publication":
-            item = await db.publications.find_one({"id": fav["item_id"]}, {"_id": 0})
-        elif fav["item_type"] == "expert":
-            item = await db.health_experts.find_one({"id": fav["item_id"]}, {"_id": 0})
-        elif fav["item_type"] == "collaborator":
-            item = await db.researcher_profiles.find_one({"user_id": fav["item_id"]}, {"_id": 0})
-        elif fav["item_type"] == "forum":
-            item = await db.forums.find_one({"id": fav["item_id"]}, {"_id": 0})
+        item = items_by_type.get(fav["item_type"], {}).get(fav["item_id"])
         
         if item:
             enriched.append({
@@ -2912,47 +3124,46 @@ async def add_favorite(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    # Check if already favorited
-    existing = await db.favorites.find_one({
-        "user_id": user.id,
-        "item_type": favorite_data.item_type,
-        "item_id": favorite_data.item_id
-    })
-    
-    if existing:
-        # Return the existing favorite ID for toggle functionality
-        return {"status": "already_favorited", "favorite_id": existing.get("id"), "action": "exists"}
-    
-    # If item_data is provided (API-fetched item), save it to database first
-    if favorite_data.item_data:
-        item_data = favorite_data.item_data
-        
-        if favorite_data.item_type == "trial":
-            # Check if trial already exists
-            existing_trial = await db.clinical_trials.find_one({"id": favorite_data.item_id})
-            if not existing_trial:
-                # Save to clinical_trials collection
-                await db.clinical_trials.insert_one(item_data)
-        
-        elif favorite_data.item_type == "publication":
-            # Check if publication already exists
-            existing_pub = await db.publications.find_one({"id": favorite_data.item_id})
-            if not existing_pub:
-                # Save to publications collection
-                await db.publications.insert_one(item_data)
-    
-    # Create favorite record
-    favorite = Favorite(
+    # Single upsert keyed on the unique (user_id, item_type, item_id) index; the
+    # pre-update document is None only when this call inserted the favorite
+    favorite_dict = Favorite(
         user_id=user.id,
         item_type=favorite_data.item_type,
         item_id=favorite_data.item_id
+    ).model_dump(mode="json")
+    favorite_op = db.favorites.find_one_and_update(
+        {
+            "user_id": user.id,
+            "item_type": favorite_data.item_type,
+            "item_id": favorite_data.item_id
+        },
+        {"$setOnInsert": favorite_dict},
+        upsert=True,
+        projection={"_id": 0, "id": 1},
+        return_document=ReturnDocument.BEFORE
     )
     
-    favorite_dict = favorite.model_dump()
-    favorite_dict['created_at'] = favorite_dict['created_at'].isoformat()
-    await db.favorites.insert_one(favorite_dict)
+    # If item_data is provided (API-fetched item), save it to database alongside
+    item_collections = {"trial": db.clinical_trials, "publication": db.publications}
+    item_collection = item_collections.get(favorite_data.item_type)
+    if favorite_data.item_data and item_collection is not None:
+        item_data = {k: v for k, v in favorite_data.item_data.items() if k not in ("_id", "id")}
+        if favorite_data.item_type == "publication":
+            item_data["authors_norm"] = authors_norm(item_data.get("authors") or [])
+        item_op = item_collection.update_one(
+            {"id": favorite_data.item_id},
+            {"$setOnInsert": item_data},
+            upsert=True
+        )
+        existing, _ = await asyncio.gather(favorite_op, item_op)
+    else:
+        existing = await favorite_op
     
-    return {"status": "success", "favorite_id": favorite.id, "action": "added"}
+    if existing:
+        # Return the existing favorite ID for toggle functionality
+        return {"status": "already_favorited", "favorite_id": existing.get("id"), "action": "exists"}
+    
+    return {"status": "success", "favorite_id": favorite_dict["id"], "action": "added"}
 
 @api_router.delete("/favorites/{favorite_id}")
 async def remove_favorite(
@@ -3017,13 +3228,16 @@ async def create_appointment_request(
         duration_suffering=request_data.duration_suffering
     )
     
-    appointment_dict = appointment.model_dump()
-    appointment_dict['created_at'] = appointment_dict['created_at'].isoformat()
-    await db.appointments.insert_one(appointment_dict)
+    appointment_dict = appointment.model_dump(mode="json")
+    
+    # Insert the appointment while checking the researcher exists (copy keeps _id out of the response dict)
+    _, researcher_exists = await asyncio.gather(
+        db.appointments.insert_one(appointment_dict.copy()),
+        db.users.count_documents({"id": request_data.researcher_id}, limit=1)
+    )
     
     # Create notification for researcher
-    researcher = await db.users.find_one({"id": request_data.researcher_id}, {"_id": 0})
-    if researcher:
+    if researcher_exists:
         notification = Notification(
             user_id=request_data.researcher_id,
             type="appointment_request",
@@ -3031,11 +3245,9 @@ async def create_appointment_request(
             content=f"{request_data.patient_name} has requested an appointment for {request_data.condition}",
             link="/notifications"
         )
-        notif_dict = notification.model_dump()
-        notif_dict['created_at'] = notif_dict['created_at'].isoformat()
-        await db.notifications.insert_one(notif_dict)
+        send_notification_in_background(notification.model_dump(mode="json"))
     
-    return {"status": "success", "appointment": appointment.model_dump()}
+    return {"status": "success", "appointment": appointment_dict}
 
 @api_router.get("/appointments")
 async def get_appointments(
@@ -3074,12 +3286,6 @@ async def accept_appointment(
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     
-    # Update appointment status
-    await db.appointments.update_one(
-        {"id": appointment_id},
-        {"$set": {"status": "accepted"}}
-    )
-    
     # Create chat room
     chat_room = ChatRoom(
         appointment_id=appointment_id,
@@ -3087,9 +3293,7 @@ async def accept_appointment(
         researcher_id=user.id
     )
     
-    room_dict = chat_room.model_dump()
-    room_dict['created_at'] = room_dict['created_at'].isoformat()
-    await db.chat_rooms.insert_one(room_dict)
+    room_dict = chat_room.model_dump(mode="json")
     
     # ✅ CREATE NOTIFICATION FOR PATIENT
     notification = Notification(
@@ -3099,9 +3303,16 @@ async def accept_appointment(
         content="Your appointment request has been accepted. You can now join the consultation.",
         link=f"/chat/{chat_room.id}"
     )
-    notif_dict = notification.model_dump()
-    notif_dict['created_at'] = notif_dict['created_at'].isoformat()
-    await db.notifications.insert_one(notif_dict)
+    
+    # Status update and chat room are independent writes - issue them together
+    await asyncio.gather(
+        db.appointments.update_one(
+            {"id": appointment_id},
+            {"$set": {"status": "accepted"}}
+        ),
+        db.chat_rooms.insert_one(room_dict)
+    )
+    send_notification_in_background(notification.model_dump(mode="json"))
     
     logging.info(f"✅ Chat room created: {chat_room.id} for patient {appointment['patient_id']}")
     logging.info(f"✅ Notification sent to patient {appointment['patient_id']}")
@@ -3148,87 +3359,128 @@ async def get_user_activity(
         "favorites_count": 0
     }
     
-    # Get appointments
-    appointments = await db.appointments.find(
-        {"$or": [{"patient_id": user.id}, {"researcher_id": user.id}]},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(100)
+    is_researcher = "researcher" in user.roles
+    
+    # All top-level queries are independent - run them concurrently
+    queries = [
+        # Appointments, joined with the researcher's profile in the same round-trip
+        db.appointments.aggregate([
+            {"$match": {"$or": [{"patient_id": user.id}, {"researcher_id": user.id}]}},
+            {"$sort": {"created_at": -1}},
+            {"$limit": 100},
+            {"$lookup": {
+                "from": "researcher_profiles",
+                "let": {"researcher_id": "$researcher_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$user_id", "$$researcher_id"]}}},
+                    {"$project": {"_id": 0, "name": 1, "sector": 1}}
+                ],
+                "as": "researcher_profile"
+            }},
+            {"$addFields": {"researcher_profile": {"$first": "$researcher_profile"}}},
+            {"$project": {"_id": 0}}
+        ]).to_list(100),
+        # Forums joined (memberships)
+        db.forum_memberships.find({"user_id": user.id}, {"_id": 0}).to_list(100),
+        # Reviews given
+        db.reviews.find({"reviewer_id": user.id}, {"_id": 0}).to_list(100),
+        # Favorites count
+        db.favorites.count_documents({"user_id": user.id})
+    ]
+    if is_researcher:
+        queries += [
+            # Trials created
+            db.clinical_trials.find({"created_by": user.id}, {"_id": 0}).to_list(100),
+            # Collaboration history
+            db.collaborations.find(
+                {"$or": [{"researcher1_id": user.id}, {"researcher2_id": user.id}]},
+                {"_id": 0}
+            ).to_list(100)
+        ]
+    
+    results = await asyncio.gather(*queries)
+    appointments, memberships, reviews, favorites_count = results[:4]
+    trials_created, collaborations_history = results[4:] if is_researcher else ([], [])
+    
+    # Enrichment lookups also run concurrently
+    def partner_of(collab):
+        return collab["researcher2_id"] if collab["researcher1_id"] == user.id else collab["researcher1_id"]
+    
+    forum_ids = list({membership["forum_id"] for membership in memberships})
+    partner_ids = list({partner_of(collab) for collab in collaborations_history})
+    
+    async def load_forums():
+        # Joined-forum details and (for researchers) forums created come from the same
+        # collection - fetch both in one round-trip with $facet
+        forum_filters = []
+        if forum_ids:
+            forum_filters.append({"id": {"$in": forum_ids}})
+        if is_researcher:
+            forum_filters.append({"created_by": user.id})
+        if not forum_filters:
+            return {}, []
+        
+        facets = await db.forums.aggregate([
+            {"$match": {"$or": forum_filters}},
+            {"$facet": {
+                "joined": [
+                    {"$match": {"id": {"$in": forum_ids}}},
+                    {"$project": {"_id": 0, "id": 1, "name": 1, "description": 1, "category": 1, "post_count": 1}}
+                ],
+                "created": [
+                    {"$match": {"created_by": user.id}},
+                    {"$limit": 100},
+                    {"$project": {"_id": 0}}
+                ]
+            }}
+        ]).to_list(1)
+        facet = facets[0] if facets else {"joined": [], "created": []}
+        return {forum["id"]: forum for forum in facet["joined"]}, facet["created"]
+    
+    async def load_partners():
+        if not partner_ids:
+            return {}
+        docs = await db.researcher_profiles.find(
+            {"user_id": {"$in": partner_ids}},
+            {"_id": 0, "user_id": 1, "name": 1, "sector": 1}
+        ).to_list(len(partner_ids))
+        return {doc["user_id"]: doc for doc in docs}
+    
+    (forums_by_id, forums_created), partners_by_id = await asyncio.gather(load_forums(), load_partners())
     
     # Enrich appointments with user details
     for appt in appointments:
+        researcher = appt.pop("researcher_profile", None)
         if appt.get("researcher_id"):
-            researcher = await db.researcher_profiles.find_one({"user_id": appt["researcher_id"]}, {"_id": 0})
             if researcher:
                 appt["researcher_name"] = researcher.get("name", "Unknown")
                 appt["researcher_specialty"] = researcher.get("sector", "N/A")
-        appt["created_at"] = appt["created_at"].isoformat() if isinstance(appt.get("created_at"), datetime) else appt.get("created_at")
     
     activity["appointments"] = appointments
     
-    # Get forums joined (memberships)
-    memberships = await db.forum_memberships.find(
-        {"user_id": user.id},
-        {"_id": 0}
-    ).to_list(100)
-    
-    # Enrich with forum details
+    # Enrich memberships with forum details
     for membership in memberships:
-        forum = await db.forums.find_one({"id": membership["forum_id"]}, {"_id": 0})
+        forum = forums_by_id.get(membership["forum_id"])
         if forum:
             membership["forum_details"] = forum
-            membership["joined_at"] = membership["joined_at"].isoformat() if isinstance(membership.get("joined_at"), datetime) else membership.get("joined_at")
     
     activity["forums_joined"] = memberships
     
-    # Get forums created (if researcher)
-    if "researcher" in user.roles:
-        forums_created = await db.forums.find(
-            {"created_by": user.id},
-            {"_id": 0}
-        ).to_list(100)
-        for forum in forums_created:
-            forum["created_at"] = forum["created_at"].isoformat() if isinstance(forum.get("created_at"), datetime) else forum.get("created_at")
+    if is_researcher:
         activity["forums_created"] = forums_created
-        
-        # Get trials created
-        trials_created = await db.clinical_trials.find(
-            {"created_by": user.id},
-            {"_id": 0}
-        ).to_list(100)
-        for trial in trials_created:
-            trial["created_at"] = trial["created_at"].isoformat() if isinstance(trial.get("created_at"), datetime) else trial.get("created_at")
         activity["trials_created"] = trials_created
     
-    # Get reviews given
-    reviews = await db.reviews.find(
-        {"reviewer_id": user.id},
-        {"_id": 0}
-    ).to_list(100)
-    for review in reviews:
-        review["created_at"] = review["created_at"].isoformat() if isinstance(review.get("created_at"), datetime) else review.get("created_at")
     activity["reviews_given"] = reviews
     
-    # Get favorites count
-    favorites_count = await db.favorites.count_documents({"user_id": user.id})
     activity["favorites_count"] = favorites_count
     
-    # Get collaboration history (for researchers)
-    if "researcher" in user.roles:
-        collaborations_history = await db.collaborations.find(
-            {"$or": [{"researcher1_id": user.id}, {"researcher2_id": user.id}]},
-            {"_id": 0}
-        ).to_list(100)
-        
-        # Enrich with partner details
+    # Collaboration history with partner details (for researchers)
+    if is_researcher:
         for collab in collaborations_history:
-            partner_id = collab["researcher2_id"] if collab["researcher1_id"] == user.id else collab["researcher1_id"]
-            partner_profile = await db.researcher_profiles.find_one({"user_id": partner_id}, {"_id": 0})
+            partner_profile = partners_by_id.get(partner_of(collab))
             if partner_profile:
                 collab["partner_name"] = partner_profile.get("name", "Unknown")
                 collab["partner_sector"] = partner_profile.get("sector", "Unknown")
-            collab["created_at"] = collab["created_at"].isoformat() if isinstance(collab.get("created_at"), datetime) else collab.get("created_at")
-            if collab.get("ended_at"):
-                collab["ended_at"] = collab["ended_at"].isoformat() if isinstance(collab.get("ended_at"), datetime) else collab.get("ended_at")
         
         activity["collaborations_history"] = collaborations_history
     
@@ -3250,11 +3502,11 @@ async def send_collaboration_request(
     if "researcher" not in user.roles:
         raise HTTPException(status_code=403, detail="Only researchers can send collaboration requests")
     
-    # Get sender profile for name
-    sender_profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
-    
-    # Get receiver profile for name
-    receiver_profile = await db.researcher_profiles.find_one({"user_id": request_data["receiver_id"]}, {"_id": 0})
+    # Get sender and receiver profiles for names
+    sender_profile, receiver_profile = await asyncio.gather(
+        get_researcher_profile_cached(user.id),
+        get_researcher_profile_cached(request_data["receiver_id"])
+    )
     receiver_name = receiver_profile.get("name", "Unknown") if receiver_profile else "Unknown"
     
     collab_request = CollaborationRequest(
@@ -3267,10 +3519,7 @@ async def send_collaboration_request(
         message=request_data["message"]
     )
     
-    # Save request
-    request_dict = collab_request.dict()
-    request_dict["created_at"] = request_dict["created_at"].isoformat()
-    await db.collaboration_requests.insert_one(request_dict)
+    request_dict = collab_request.model_dump(mode="json")
     
     # Create notification for receiver
     notification = Notification(
@@ -3280,9 +3529,8 @@ async def send_collaboration_request(
         content=f"{collab_request.sender_name} wants to collaborate with you on {request_data['purpose']}",
         link="/notifications"
     )
-    notif_dict = notification.dict()
-    notif_dict["created_at"] = notif_dict["created_at"].isoformat()
-    await db.notifications.insert_one(notif_dict)
+    await db.collaboration_requests.insert_one(request_dict)
+    send_notification_in_background(notification.model_dump(mode="json"))
     
     return {"status": "success", "request_id": collab_request.id}
 
@@ -3323,12 +3571,6 @@ async def accept_collaboration_request(
     if request["status"] != "pending":
         raise HTTPException(status_code=400, detail="Request already processed")
     
-    # Update request status
-    await db.collaboration_requests.update_one(
-        {"id": request_id},
-        {"$set": {"status": "accepted"}}
-    )
-    
     # Create collaboration
     collaboration = Collaboration(
         researcher1_id=request["sender_id"],
@@ -3336,9 +3578,7 @@ async def accept_collaboration_request(
         request_id=request_id
     )
     
-    collab_dict = collaboration.dict()
-    collab_dict["created_at"] = collab_dict["created_at"].isoformat()
-    await db.collaborations.insert_one(collab_dict)
+    collab_dict = collaboration.model_dump(mode="json")
     
     # Notify sender
     notification = Notification(
@@ -3348,9 +3588,16 @@ async def accept_collaboration_request(
         content="Your collaboration request was accepted! You can now start chatting.",
         link="/dashboard"
     )
-    notif_dict = notification.dict()
-    notif_dict["created_at"] = notif_dict["created_at"].isoformat()
-    await db.notifications.insert_one(notif_dict)
+    
+    # Update request status and create collaboration in one batch of concurrent writes
+    await asyncio.gather(
+        db.collaboration_requests.update_one(
+            {"id": request_id},
+            {"$set": {"status": "accepted"}}
+        ),
+        db.collaborations.insert_one(collab_dict)
+    )
+    send_notification_in_background(notification.model_dump(mode="json"))
     
     return {"status": "success", "collaboration_id": collaboration.id}
 
@@ -3372,9 +3619,18 @@ async def reject_collaboration_request(
         raise HTTPException(status_code=404, detail="Request not found or already processed")
     
     # Get receiver profile for name
-    receiver_profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    receiver_profile = await get_researcher_profile_cached(user.id)
     receiver_name = receiver_profile.get("name", user.name) if receiver_profile else user.name
     
+    # Notify sender about rejection
+    notification = Notification(
+        user_id=request["sender_id"],
+        type="collaboration_rejected",
+        title="Collaboration Request Declined",
+        content=f"{receiver_name} declined your collaboration request. Reason: {rejection_data.get('reason', 'No reason provided')}",
+        link="/notifications"
+    )
+    
     # Update request status with reason
     await db.collaboration_requests.update_one(
         {"id": request_id},
@@ -3384,18 +3640,7 @@ async def reject_collaboration_request(
             "receiver_name": receiver_name
         }}
     )
-    
-    # Notify sender about rejection
-    notification = Notification(
-        user_id=request["sender_id"],
-        type="collaboration_rejected",
-        title="Collaboration Request Declined",
-        content=f"{receiver_name} declined your collaboration request. Reason: {rejection_data.get('reason', 'No reason provided')}",
-        link="/notifications"
-    )
-    notif_dict = notification.dict()
-    notif_dict["created_at"] = notif_dict["created_at"].isoformat()
-    await db.notifications.insert_one(notif_dict)
+    send_notification_in_background(notification.model_dump(mode="json"))
     
     return {"status": "success"}
 
@@ -3420,13 +3665,23 @@ async def get_collaborations(
         {"_id": 0}
     ).to_list(100)
     
-    # Enrich with partner details
-    for collab in collaborations:
-        partner_id = collab["researcher2_id"] if collab["researcher1_id"] == user.id else collab["researcher1_id"]
-        partner_profile = await db.researcher_profiles.find_one({"user_id": partner_id}, {"_id": 0})
+    # Enrich with partner details (one $in query for all partners)
+    partner_ids = [
+        collab["researcher2_id"] if collab["researcher1_id"] == user.id else collab["researcher1_id"]
+        for collab in collaborations
+    ]
+    partners_by_id = {}
+    if partner_ids:
+        partner_profiles = await db.researcher_profiles.find(
+            {"user_id": {"$in": list(set(partner_ids))}},
+            {"_id": 0}
+        ).to_list(len(partner_ids))
+        partners_by_id = {profile["user_id"]: profile for profile in partner_profiles}
+    
+    for collab, partner_id in zip(collaborations, partner_ids):
+        partner_profile = partners_by_id.get(partner_id)
         if partner_profile:
             collab["partner"] = partner_profile
-            collab["partner"]["user_id"] = partner_id
     
     return collaborations
 
@@ -3458,9 +3713,15 @@ async def end_collaboration(
     
     return {"status": "success"}
 
+# Chat and collaboration message history: the whole history (up to the cap) unless the
+# client asks for a latest-first keyset page with ?limit= (the frontend doesn't page yet)
+MESSAGES_HISTORY_MAX = 1000
+
 @api_router.get("/collaborations/{collaboration_id}/messages")
 async def get_collaboration_messages(
     collaboration_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit for the full history"),
+    before: Optional[str] = Query(None, description="ISO timestamp; only messages older than this are returned"),
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
@@ -3470,20 +3731,25 @@ async def get_collaboration_messages(
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     # Verify user is part of collaboration
-    collaboration = await db.collaborations.find_one({
+    is_member = await db.collaborations.count_documents({
         "id": collaboration_id,
         "$or": [{"researcher1_id": user.id}, {"researcher2_id": user.id}]
-    })
+    }, limit=1)
     
-    if not collaboration:
+    if not is_member:
         raise HTTPException(status_code=404, detail="Collaboration not found")
     
-    # Get messages
+    # Get the newest page of messages (older pages via ?before=<created_at of oldest message>)
+    query = {"collaboration_id": collaboration_id}
+    if before:
+        query["created_at"] = {"$lt": before}
     messages = await db.collaboration_messages.find(
-        {"collaboration_id": collaboration_id},
+        query,
         {"_id": 0}
-    ).sort("created_at", 1).to_list(1000)
+    ).sort("created_at", -1).limit(limit or MESSAGES_HISTORY_MAX).to_list(None)
     
+    # Return in chronological order
+    messages.reverse()
     return messages
 
 @api_router.post("/collaborations/{collaboration_id}/messages")
@@ -3515,8 +3781,7 @@ async def send_collaboration_message(
         message=message_data["message"]
     )
     
-    msg_dict = message.dict()
-    msg_dict["created_at"] = msg_dict["created_at"].isoformat()
+    msg_dict = message.model_dump(mode="json")
     await db.collaboration_messages.insert_one(msg_dict)
     
     # Return without MongoDB's _id field
@@ -3549,18 +3814,18 @@ async def submit_collaboration_review(
     if not collaboration:
         raise HTTPException(status_code=404, detail="Collaboration not found")
     
-    # Determine partner ID
-    partner_id = collaboration["researcher2_id"] if collaboration["researcher1_id"] == user.id else collaboration["researcher1_id"]
-    
-    # Check if review already exists
-    existing_review = await db.collaboration_reviews.find_one({
+    # Check if already reviewed (the unique index below also catches concurrent submits)
+    already_reviewed = await db.collaboration_reviews.count_documents({
         "collaboration_id": collaboration_id,
         "reviewer_id": user.id
-    })
+    }, limit=1)
     
-    if existing_review:
+    if already_reviewed:
         raise HTTPException(status_code=400, detail="You have already reviewed this collaboration")
     
+    # Determine partner ID
+    partner_id = collaboration["researcher2_id"] if collaboration["researcher1_id"] == user.id else collaboration["researcher1_id"]
+    
     # Create review
     review = CollaborationReview(
         collaboration_id=collaboration_id,
@@ -3570,12 +3835,10 @@ async def submit_collaboration_review(
         text=review_data["text"]
     )
     
-    review_dict = review.dict()
-    review_dict["created_at"] = review_dict["created_at"].isoformat()
-    await db.collaboration_reviews.insert_one(review_dict)
+    review_dict = review.model_dump(mode="json")
     
     # Notify the partner
-    reviewer_profile = await db.researcher_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    reviewer_profile = await get_researcher_profile_cached(user.id)
     reviewer_name = reviewer_profile.get("name", user.name) if reviewer_profile else user.name
     
     notification = Notification(
@@ -3585,9 +3848,14 @@ async def submit_collaboration_review(
         content=f"{reviewer_name} left you a {review_data['rating']}-star review",
         link="/dashboard"
     )
-    notif_dict = notification.dict()
-    notif_dict["created_at"] = notif_dict["created_at"].isoformat()
-    await db.notifications.insert_one(notif_dict)
+    notif_dict = notification.model_dump(mode="json")
+    
+    # The unique (collaboration_id, reviewer_id) index rejects a second review racing the check above
+    try:
+        await db.collaboration_reviews.insert_one(review_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="You have already reviewed this collaboration")
+    send_notification_in_background(notif_dict)
     
     return {"status": "success", "review_id": review.id}
 
@@ -3611,17 +3879,21 @@ async def get_collaboration_reviews(
     if not collaboration:
         raise HTTPException(status_code=404, detail="Collaboration not found")
     
-    # Get reviews
-    reviews = await db.collaboration_reviews.find(
-        {"collaboration_id": collaboration_id},
-        {"_id": 0}
-    ).to_list(10)
-    
-    # Enrich with reviewer details
-    for review in reviews:
-        reviewer_profile = await db.researcher_profiles.find_one({"user_id": review["reviewer_id"]}, {"_id": 0})
-        if reviewer_profile:
-            review["reviewer_name"] = reviewer_profile.get("name", "Unknown")
+    # Get reviews enriched with reviewer names in one aggregation
+    reviews = await db.collaboration_reviews.aggregate([
+        {"$match": {"collaboration_id": collaboration_id}},
+        {"$limit": 10},
+        {"$lookup": {
+            "from": "researcher_profiles",
+            "localField": "reviewer_id",
+            "foreignField": "user_id",
+            "as": "_rp"
+        }},
+        {"$addFields": {
+            "reviewer_name": {"$ifNull": [{"$arrayElemAt": ["$_rp.name", 0]}, "Unknown"]}
+        }},
+        {"$project": {"_id": 0, "_rp": 0}}
+    ]).to_list(10)
     
     return reviews
 
@@ -3662,6 +3934,8 @@ async def mark_notification_read(
     
     return {"status": "success"}
 
+UNREAD_COUNT_CAP = 100  # Unread counts at or above this are reported as capped
+
 @api_router.get("/notifications/unread-count")
 async def get_unread_count(
     session_token: Optional[str] = Cookie(None),
@@ -3672,8 +3946,9 @@ async def get_unread_count(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    count = await db.notifications.count_documents({"user_id": user.id, "read": False})
-    return {"count": count}
+    # The badge only needs "N" up to a cap, so stop counting there (served by the unread_by_user partial index)
+    count = await db.notifications.count_documents({"user_id": user.id, "read": False}, limit=UNREAD_COUNT_CAP)
+    return {"count": count, "capped": count >= UNREAD_COUNT_CAP}
 
 # ============ Chat Room Endpoints ============
 
@@ -3693,29 +3968,47 @@ async def get_chat_rooms(
     elif "researcher" in user.roles:
         query["researcher_id"] = user.id
     
-    rooms = await db.chat_rooms.find(query, {"_id": 0}).to_list(100)
-    
-    # Enrich with appointment and user data
-    for room in rooms:
-        appointment = await db.appointments.find_one({"id": room["appointment_id"]}, {"_id": 0})
-        if appointment:
-            room["appointment"] = appointment
-        
-        # Get other user info
-        other_user_id = room["researcher_id"] if "patient" in user.roles else room["patient_id"]
-        other_user = await db.users.find_one({"id": other_user_id}, {"_id": 0})
-        if other_user:
-            room["other_user"] = {
-                "id": other_user["id"],
-                "name": other_user["name"],
-                "picture": other_user.get("picture")
-            }
+    # The other participant is the researcher for patients, the patient otherwise
+    other_user_field = "researcher_id" if "patient" in user.roles else "patient_id"
+    
+    # Enrich with appointment and user data in one aggregation
+    rooms = await db.chat_rooms.aggregate([
+        {"$match": query},
+        {"$limit": 100},
+        {"$lookup": {
+            "from": "appointments",
+            "localField": "appointment_id",
+            "foreignField": "id",
+            "as": "appointment"
+        }},
+        {"$unwind": {"path": "$appointment", "preserveNullAndEmptyArrays": True}},
+        {"$lookup": {
+            "from": "users",
+            "localField": other_user_field,
+            "foreignField": "id",
+            "as": "_ou"
+        }},
+        {"$addFields": {
+            "other_user": {"$cond": [
+                {"$gt": [{"$size": "$_ou"}, 0]},
+                {
+                    "id": {"$arrayElemAt": ["$_ou.id", 0]},
+                    "name": {"$arrayElemAt": ["$_ou.name", 0]},
+                    "picture": {"$arrayElemAt": ["$_ou.picture", 0]}
+                },
+                "$$REMOVE"
+            ]}
+        }},
+        {"$project": {"_id": 0, "appointment._id": 0, "_ou": 0}}
+    ]).to_list(100)
     
     return rooms
 
 @api_router.get("/chat-rooms/{room_id}/messages")
 async def get_chat_messages(
     room_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit for the full history"),
+    before: Optional[str] = Query(None, description="ISO timestamp; only messages older than this are returned"),
     session_token: Optional[str] = Cookie(None),
     authorization: Optional[str] = Header(None)
 ):
@@ -3732,11 +4025,17 @@ async def get_chat_messages(
     if room["patient_id"] != user.id and room["researcher_id"] != user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    # Get the newest page of messages (older pages via ?before=<created_at of oldest message>)
+    query = {"chat_room_id": room_id}
+    if before:
+        query["created_at"] = {"$lt": before}
     messages = await db.chat_messages.find(
-        {"chat_room_id": room_id},
+        query,
         {"_id": 0}
-    ).sort("created_at", 1).to_list(1000)
+    ).sort("created_at", -1).limit(limit or MESSAGES_HISTORY_MAX).to_list(None)
     
+    # Return in chronological order
+    messages.reverse()
     return messages
 
 @api_router.post("/chat-rooms/{room_id}/messages")
@@ -3773,8 +4072,7 @@ async def send_chat_message(
         content=message_data.get("content", "")
     )
     
-    msg_dict = message.dict()
-    msg_dict['created_at'] = msg_dict['created_at'].isoformat()
+    msg_dict = message.model_dump(mode="json")
     await db.chat_messages.insert_one(msg_dict)
     
     # Return clean response without _id
@@ -3842,7 +4140,7 @@ async def create_review(
         raise HTTPException(status_code=403, detail="Only patients can leave reviews")
     
     # Get appointment
-    appointment = await db.appointments.find_one({"id": review_data.appointment_id}, {"_id": 0})
+    appointment = await appointments_by_id.load(review_data.appointment_id)
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     
@@ -3861,9 +4159,7 @@ async def create_review(
         comment=review_data.comment
     )
     
-    review_dict = review.model_dump()
-    review_dict['created_at'] = review_dict['created_at'].isoformat()
-    await db.reviews.insert_one(review_dict)
+    review_dict = review.model_dump(mode="json")
     
     # Create notification for researcher
     notification = Notification(
@@ -3873,11 +4169,12 @@ async def create_review(
         content=f"You received a {review_data.rating}-star review from a patient",
         link="/notifications"
     )
-    notif_dict = notification.model_dump()
-    notif_dict['created_at'] = notif_dict['created_at'].isoformat()
-    await db.notifications.insert_one(notif_dict)
+    notif_dict = notification.model_dump(mode="json")
     
-    return {"status": "success", "review": review.model_dump()}
+    await db.reviews.insert_one(review_dict.copy())
+    send_notification_in_background(notif_dict)
+    
+    return {"status": "success", "review": review_dict}
 
 @api_router.get("/reviews/researcher/{researcher_id}")
 async def get_researcher_reviews(
@@ -3890,21 +4187,28 @@ async def get_researcher_reviews(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    reviews = await db.reviews.find(
-        {"researcher_id": researcher_id},
-        {"_id": 0, "patient_id": 0}
-    ).sort("created_at", -1).to_list(100)
+    # Latest reviews and rating stats in one aggregation
+    result = await db.reviews.aggregate([
+        {"$match": {"researcher_id": researcher_id}},
+        {"$facet": {
+            "reviews": [
+                {"$sort": {"created_at": -1}},
+                {"$limit": 100},
+                {"$project": {"_id": 0, "patient_id": 0}}
+            ],
+            "stats": [
+                {"$group": {"_id": None, "avg": {"$avg": "$rating"}, "n": {"$sum": 1}}}
+            ]
+        }}
+    ]).to_list(1)
     
-    # Calculate average rating
-    if reviews:
-        avg_rating = sum(r["rating"] for r in reviews) / len(reviews)
-    else:
-        avg_rating = 0
+    reviews = result[0]["reviews"] if result else []
+    stats = result[0]["stats"][0] if result and result[0]["stats"] else {"avg": 0, "n": 0}
     
     return {
         "reviews": reviews,
-        "average_rating": round(avg_rating, 1),
-        "total_reviews": len(reviews)
+        "average_rating": round(stats["avg"] or 0, 1),
+        "total_reviews": stats["n"]
     }
 
 # ============ Seed Data Endpoint ============
@@ -3942,11 +4246,6 @@ async def seed_data():
         }
     ]
     
-    for trial in trials_sample:
-        existing = await db.clinical_trials.find_one({"title": trial["title"]})
-        if not existing:
-            await db.clinical_trials.insert_one(trial)
-    
     # Seed publications
     publications_sample = [
         {
@@ -3977,11 +4276,6 @@ async def seed_data():
         }
     ]
     
-    for pub in publications_sample:
-        existing = await db.publications.find_one({"title": pub["title"]})
-        if not existing:
-            await db.publications.insert_one(pub)
-    
     # Seed health experts
     experts_sample = [
         {
@@ -4006,11 +4300,6 @@ async def seed_data():
         }
     ]
     
-    for expert in experts_sample:
-        existing = await db.health_experts.find_one({"name": expert["name"]})
-        if not existing:
-            await db.health_experts.insert_one(expert)
-    
     # Seed forums
     forums_sample = [
         {
@@ -4033,10 +4322,29 @@ async def seed_data():
         }
     ]
     
-    for forum in forums_sample:
-        existing = await db.forums.find_one({"name": forum["name"]})
-        if not existing:
-            await db.forums.insert_one(forum)
+    # Insert each sample only if no document with its title/name exists yet:
+    # one unordered bulk upsert per collection, all four collections in parallel
+    await asyncio.gather(
+        db.clinical_trials.bulk_write(
+            [UpdateOne({"title": t["title"]}, {"$setOnInsert": t}, upsert=True) for t in trials_sample],
+            ordered=False
+        ),
+        db.publications.bulk_write(
+            [
+                UpdateOne({"title": p["title"]}, {"$setOnInsert": {**p, "authors_norm": authors_norm(p["authors"])}}, upsert=True)
+                for p in publications_sample
+            ],
+            ordered=False
+        ),
+        db.health_experts.bulk_write(
+            [UpdateOne({"name": e["name"]}, {"$setOnInsert": {**e, **expert_search_fields(e)}}, upsert=True) for e in experts_sample],
+            ordered=False
+        ),
+        db.forums.bulk_write(
+            [UpdateOne({"name": f["name"]}, {"$setOnInsert": f}, upsert=True) for f in forums_sample],
+            ordered=False
+        )
+    )
     
     return {"status": "success", "message": "Data seeded"}
 
@@ -4046,6 +4354,109 @@ class SearchRequest(BaseModel):
     query: str
     filters: Optional[Dict[str, Any]] = {}
 
+# Joins list fields into one string for a single substring scan; real queries never contain it,
+# so a match cannot span two entries (an empty join means an empty list, which never matches)
+AREA_SEPARATOR = "\x00"
+
+def build_expert_search_pipeline(query: str, patient_conditions: List[str]) -> List[Dict[str, Any]]:
+    """
+    Aggregation that scores health experts for search server-side: substring matches on the
+    lowercased fields and patient-condition boosts, then a rating boost for the experts that
+    matched, top 10 by match_score
+    """
+    def contains(field: str, needle: str) -> Dict[str, Any]:
+        return {"$gte": [{"$indexOfCP": [field, {"$literal": needle}]}, 0]}
+    
+    def any_area_contains(needle: str) -> Dict[str, Any]:
+        return {"$anyElementTrue": [{"$map": {
+            "input": "$research_areas_lc",
+            "in": {"$gte": [{"$indexOfCP": ["$$this", {"$literal": needle}]}, 0]}
+        }}]}
+    
+    # (condition, points, reason) for every scoring rule
+    rules = [
+        (contains("$name_lc", query), 30, "Name match"),
+        (contains("$specialty_lc", query), 25, "Specialty match"),
+        (any_area_contains(query), 20, "Research area match"),
+        (contains("$bio_lc", query), 10, "Bio match"),
+    ]
+    
+    # Personalized matching based on patient conditions
+    for condition in patient_conditions:
+        condition_lower = condition.lower()
+        rules.append((contains("$specialty_lc", condition_lower), 15, f"Specialty matches your condition: {condition}"))
+        rules.append((any_area_contains(condition_lower), 10, f"Research area matches your condition: {condition}"))
+    
+    return [
+        # Lowercased fields are precomputed on write; fall back for experts saved before that
+        {"$project": {
+            **EXPERT_LIST_PROJECTION,
+            "name_lc": {"$ifNull": ["$name_lc", {"$toLower": "$name"}]},
+            "specialty_lc": {"$ifNull": ["$specialty_lc", {"$toLower": "$specialty"}]},
+            "bio_lc": {"$ifNull": ["$bio_lc", {"$toLower": "$bio"}]},
+            "research_areas_lc": {"$ifNull": ["$research_areas_lc", {"$map": {
+                "input": {"$ifNull": ["$research_areas", []]},
+                "in": {"$toLower": "$$this"}
+            }}]}
+        }},
+        {"$addFields": {
+            "match_score": {"$add": [{"$cond": [rule, points, 0]} for rule, points, _ in rules]},
+            "match_reasons": {"$concatArrays": [
+                {"$cond": [rule, [{"$literal": reason}], []]} for rule, _, reason in rules
+            ]},
+            "_member": {"$and": ["$is_platform_member", {"$ne": [{"$ifNull": ["$user_id", ""]}, ""]}]}
+        }},
+        # Experts that match nothing are never returned, so drop them before the ratings lookup
+        {"$match": {"match_score": {"$gt": 0}}},
+        # Add ratings if platform member
+        {"$lookup": {
+            "from": "reviews",
+            "let": {"uid": "$user_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$researcher_id", "$$uid"]}}},
+                {"$group": {"_id": None, "avg": {"$avg": "$rating"}, "n": {"$sum": 1}}}
+            ],
+            "as": "_rating"
+        }},
+        {"$addFields": {
+            "_avg": {"$ifNull": [{"$arrayElemAt": ["$_rating.avg", 0]}, 0]},
+            "_n": {"$ifNull": [{"$arrayElemAt": ["$_rating.n", 0]}, 0]}
+        }},
+        {"$addFields": {
+            "average_rating": {"$cond": ["$_member", {"$round": ["$_avg", 1]}, "$$REMOVE"]},
+            "total_reviews": {"$cond": ["$_member", "$_n", "$$REMOVE"]},
+            # Boost score based on rating
+            "match_score": {"$add": [
+                "$match_score",
+                {"$cond": ["$_member", {"$toInt": {"$trunc": {"$multiply": ["$_avg", 2]}}}, 0]}
+            ]}
+        }},
+        {"$addFields": {"match_score": {"$min": ["$match_score", 100]}}},  # Cap at 100%
+        {"$sort": {"match_score": -1, "id": 1}},  # id makes ties deterministic
+        {"$limit": 10},
+        {"$project": {
+            "name_lc": 0, "specialty_lc": 0, "bio_lc": 0, "research_areas_lc": 0,
+            "_member": 0, "_rating": 0, "_avg": 0, "_n": 0
+        }}
+    ]
+
+async def text_search_fallback(collection, query: str, projection: Dict[str, int], limit: int = 10) -> List[dict]:
+    """
+    Database fallback for /search when a live API is down: the best $text matches for
+    the query (ranked by textScore), or any documents if nothing matches
+    """
+    try:
+        docs = await collection.find(
+            {"$text": {"$search": query}}, projection
+        ).sort([("score", {"$meta": "textScore"})]).limit(limit).to_list(limit)
+        if docs:
+            return docs
+    except Exception as e:
+        # Text index missing (setup_indexes.py not run yet) - fall through to unranked results
+        logger.error(f"Text search on {collection.name} failed: {e}")
+
+    return await collection.find({}, projection).limit(limit).to_list(limit)
+
 @api_router.post("/search")
 async def search(
     search_request: SearchRequest,
@@ -4060,8 +4471,8 @@ async def search(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    from clinical_trials_api import ClinicalTrialsAPI
-    from pubmed_api import PubMedAPI
+    from clinical_trials_api import get_clinical_trials_client
+    from pubmed_api import get_pubmed_client
     
     query = search_request.query.lower()
     results = {
@@ -4071,89 +4482,60 @@ async def search(
     }
     
     # Get patient profile for personalized matching
-    patient_profile = await db.patient_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    patient_profile = await get_patient_profile_cached(user.id)
     patient_conditions = patient_profile.get("conditions", []) if patient_profile else []
     
-    # Search Researchers/Experts (from database - not available via public API)
-    experts = await db.health_experts.find({}, {"_id": 0}).to_list(100)
-    for expert in experts:
-        score = 0
-        match_reasons = []
-        
-        # Check name match
-        if query in expert.get("name", "").lower():
-            score += 30
-            match_reasons.append("Name match")
-        
-        # Check specialty match
-        specialty = expert.get("specialty", "").lower()
-        if query in specialty:
-            score += 25
-            match_reasons.append("Specialty match")
-        
-        # Check research areas match
-        research_areas = [area.lower() for area in expert.get("research_areas", [])]
-        if any(query in area for area in research_areas):
-            score += 20
-            match_reasons.append("Research area match")
-        
-        # Check bio match
-        bio = expert.get("bio", "").lower()
-        if query in bio:
-            score += 10
-            match_reasons.append("Bio match")
-        
-        # Personalized matching based on patient conditions
-        for condition in patient_conditions:
-            condition_lower = condition.lower()
-            if condition_lower in specialty:
-                score += 15
-                match_reasons.append(f"Specialty matches your condition: {condition}")
-            if any(condition_lower in area for area in research_areas):
-                score += 10
-                match_reasons.append(f"Research area matches your condition: {condition}")
-        
-        # Add ratings if platform member
-        if expert.get("is_platform_member") and expert.get("user_id"):
-            reviews = await db.reviews.find(
-                {"researcher_id": expert["user_id"]},
-                {"_id": 0}
-            ).to_list(100)
-            
-            if reviews:
-                avg_rating = sum(r["rating"] for r in reviews) / len(reviews)
-                expert["average_rating"] = round(avg_rating, 1)
-                expert["total_reviews"] = len(reviews)
-                # Boost score based on rating
-                score += int(avg_rating * 2)
-            else:
-                expert["average_rating"] = 0
-                expert["total_reviews"] = 0
-        
-        if score > 0:
-            results["researchers"].append({
-                **expert,
-                "match_score": min(score, 100),  # Cap at 100%
-                "match_reasons": match_reasons
-            })
-    
-    # Search Clinical Trials from ClinicalTrials.gov API
-    try:
-        ct_api = ClinicalTrialsAPI()
+    async def fetch_api_trials():
+        ct_api = get_clinical_trials_client()
         # Use first patient condition if available, otherwise use query
         search_condition = patient_conditions[0] if patient_conditions else query
-        api_trials = ct_api.search_and_normalize(
+        return await asyncio.to_thread(
+            ct_api.search_and_normalize,
             condition=search_condition,
             status="RECRUITING",
             limit=50
         )
+    
+    async def fetch_api_publications():
+        pubmed_api = get_pubmed_client()
+        # Enhance query with disease area if available
+        search_query = query
+        if patient_conditions:
+            search_query = f"{query} {patient_conditions[0]}"
+        return await asyncio.to_thread(
+            pubmed_api.search_and_fetch,
+            query=search_query,
+            max_results=50
+        )
+    
+    # Search Researchers/Experts (from database - not available via public API), scored and ranked
+    # by mongod; both live APIs depend only on the patient conditions, so all three run concurrently.
+    # API failures come back as exceptions and fall through to the database fallbacks below
+    experts, api_trials, api_publications = await asyncio.gather(
+        db.health_experts.aggregate(build_expert_search_pipeline(query, patient_conditions)).to_list(10),
+        fetch_api_trials(),
+        fetch_api_publications(),
+        return_exceptions=True
+    )
+    if isinstance(experts, Exception):
+        raise experts
+    results["researchers"] = experts
+    
+    # Lowercase the patient conditions once for all trial and publication scoring
+    conditions_lower = [(condition, condition.lower()) for condition in patient_conditions]
+    
+    # Search Clinical Trials from ClinicalTrials.gov API
+    try:
+        if isinstance(api_trials, Exception):
+            raise api_trials
         
         for trial in api_trials:
             score = 0
             match_reasons = ["Live data from ClinicalTrials.gov"]
             
             # Check title match
-            if query in trial.get("title", "").lower():
+            title = trial.get("title", "").lower()
+            if query in title:
                 score += 30
                 match_reasons.append("Title match")
             
@@ -4162,19 +4544,18 @@ async def search(
                 score += 15
                 match_reasons.append("Description match")
             
-            # Check disease areas match
-            disease_areas = [area.lower() for area in trial.get("disease_areas", [])]
-            if any(query in area for area in disease_areas):
+            # Check disease areas match (one substring scan over the joined areas)
+            disease_areas = AREA_SEPARATOR.join(trial.get("disease_areas", [])).lower()
+            if disease_areas and query in disease_areas:
                 score += 25
                 match_reasons.append("Disease area match")
             
             # Personalized matching based on patient conditions
-            for condition in patient_conditions:
-                condition_lower = condition.lower()
-                if any(condition_lower in area for area in disease_areas):
+            for condition, condition_lower in conditions_lower:
+                if disease_areas and condition_lower in disease_areas:
                     score += 25
                     match_reasons.append(f"Targets your condition: {condition}")
-                if condition_lower in trial.get("title", "").lower():
+                if condition_lower in title:
                     score += 15
                     match_reasons.append(f"Title mentions your condition: {condition}")
             
@@ -4185,36 +4566,25 @@ async def search(
             
             # Always include API results if they match at all
             if score > 0 or len(match_reasons) > 1:
-                results["trials"].append({
-                    **trial,
-                    "match_score": min(max(score, 50), 100),  # Min 50% for API results
-                    "match_reasons": match_reasons
-                })
+                trial["match_score"] = min(max(score, 50), 100)  # Min 50% for API results
+                trial["match_reasons"] = match_reasons
+                results["trials"].append(trial)
     except Exception as e:
         logger.error(f"Error fetching from ClinicalTrials.gov: {e}")
         # Fallback to database if API fails
-        db_trials = await db.clinical_trials.find({}, {"_id": 0}).limit(10).to_list(10)
+        db_trials = await text_search_fallback(db.clinical_trials, search_request.query, {"_id": 0})
         for trial in db_trials:
             score = 50  # Default score for fallback
-            results["trials"].append({
-                **trial,
-                "match_score": score,
-                "match_reasons": ["Database result (API unavailable)"]
-            })
+            trial["match_score"] = score
+            trial["match_reasons"] = ["Database result (API unavailable)"]
+            results["trials"].append(trial)
     
     # Search Publications from PubMed API
     try:
-        pubmed_api = PubMedAPI()
-        # Enhance query with disease area if available
-        search_query = query
-        if patient_conditions:
-            search_query = f"{query} {patient_conditions[0]}"
-        
-        api_publications = pubmed_api.search_and_fetch(
-            query=search_query,
-            max_results=50
-        )
+        if isinstance(api_publications, Exception):
+            raise api_publications
         
+        current_year = datetime.now(timezone.utc).year
         for pub in api_publications:
             score = 0
             match_reasons = ["Live data from PubMed"]
@@ -4229,27 +4599,25 @@ async def search(
                 score += 15
                 match_reasons.append("Abstract match")
             
-            # Check disease areas match (MeSH terms)
-            disease_areas = [area.lower() for area in pub.get("disease_areas", [])]
-            if any(query in area for area in disease_areas):
+            # Check disease areas match (MeSH terms, one substring scan over the joined terms)
+            disease_areas = AREA_SEPARATOR.join(pub.get("disease_areas", [])).lower()
+            if disease_areas and query in disease_areas:
                 score += 25
                 match_reasons.append("Medical topic match")
             
             # Check authors match
-            authors = [author.lower() for author in pub.get("authors", [])]
-            if any(query in author for author in authors):
+            authors = AREA_SEPARATOR.join(pub.get("authors", [])).lower()
+            if authors and query in authors:
                 score += 20
                 match_reasons.append("Author match")
             
             # Personalized matching based on patient conditions
-            for condition in patient_conditions:
-                condition_lower = condition.lower()
-                if any(condition_lower in area for area in disease_areas):
+            for condition, condition_lower in conditions_lower:
+                if disease_areas and condition_lower in disease_areas:
                     score += 20
                     match_reasons.append(f"Relevant to your condition: {condition}")
             
             # Boost for recent publications
-            current_year = datetime.now(timezone.utc).year
             pub_year = pub.get("year") or 2000
             if current_year - pub_year <= 2:
                 score += 10
@@ -4257,32 +4625,23 @@ async def search(
             
             # Always include API results if they match at all
             if score > 0 or len(match_reasons) > 1:
-                results["publications"].append({
-                    **pub,
-                    "match_score": min(max(score, 50), 100),  # Min 50% for API results
-                    "match_reasons": match_reasons
-                })
+                pub["match_score"] = min(max(score, 50), 100)  # Min 50% for API results
+                pub["match_reasons"] = match_reasons
+                results["publications"].append(pub)
     except Exception as e:
         logger.error(f"Error fetching from PubMed: {e}")
         # Fallback to database if API fails
-        db_pubs = await db.publications.find({}, {"_id": 0}).limit(10).to_list(10)
+        db_pubs = await text_search_fallback(db.publications, search_request.query, {"_id": 0, "authors_norm": 0})
         for pub in db_pubs:
             score = 50  # Default score for fallback
-            results["publications"].append({
-                **pub,
-                "match_score": score,
-                "match_reasons": ["Database result (API unavailable)"]
-            })
+            pub["match_score"] = score
+            pub["match_reasons"] = ["Database result (API unavailable)"]
+            results["publications"].append(pub)
     
-    # Sort each category by match score
-    results["researchers"].sort(key=lambda x: x["match_score"], reverse=True)
-    results["trials"].sort(key=lambda x: x["match_score"], reverse=True)
-    results["publications"].sort(key=lambda x: x["match_score"], reverse=True)
-    
-    # Limit results
-    results["researchers"] = results["researchers"][:10]
-    results["trials"] = results["trials"][:10]
-    results["publications"] = results["publications"][:10]
+    # Keep the top 10 of each category by match score (heap top-k, no full sort)
+    results["researchers"] = heapq.nlargest(10, results["researchers"], key=lambda x: x["match_score"])
+    results["trials"] = heapq.nlargest(10, results["trials"], key=lambda x: x["match_score"])
+    results["publications"] = heapq.nlargest(10, results["publications"], key=lambda x: x["match_score"])
     
     # Skip AI summarization for speed - use truncated descriptions instead
     for trial in results["trials"]:
@@ -4320,7 +4679,7 @@ async def get_patient_overview(
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     # Get patient profile for personalization
-    patient_profile = await db.patient_profiles.find_one({"user_id": user.id}, {"_id": 0})
+    patient_profile = await get_patient_profile_cached(user.id)
     patient_conditions = patient_profile.get("conditions", []) if patient_profile else []
     
     # Use default medical topics if no conditions
@@ -4341,38 +4700,35 @@ async def get_patient_overview(
         "latest_publications": []
     }
     
-    # Get top rated researchers
-    experts = await db.health_experts.find({"is_platform_member": True}, {"_id": 0}).to_list(100)
-    
-    for expert in experts:
-        if expert.get("user_id"):
-            reviews = await db.reviews.find(
-                {"researcher_id": expert["user_id"]},
-                {"_id": 0}
-            ).to_list(100)
-            
-            if reviews:
-                avg_rating = sum(r["rating"] for r in reviews) / len(reviews)
-                expert["average_rating"] = round(avg_rating, 1)
-                expert["total_reviews"] = len(reviews)
-            else:
-                expert["average_rating"] = 0
-                expert["total_reviews"] = 0
-    
-    # Sort by rating and get top 3
-    experts_with_ratings = [e for e in experts if e.get("average_rating", 0) > 0]
-    experts_with_ratings.sort(key=lambda x: x.get("average_rating", 0), reverse=True)
-    overview["top_researchers"] = experts_with_ratings[:3]
+    # Get top rated researchers: ratings joined, averaged, sorted and cut to 3 inside mongod
+    overview["top_researchers"] = await db.health_experts.aggregate([
+        {"$match": {"is_platform_member": True, "user_id": {"$nin": [None, ""]}}},
+        {"$project": EXPERT_FULL_PROJECTION},
+        {"$lookup": {
+            "from": "reviews",
+            "let": {"uid": "$user_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$researcher_id", "$$uid"]}}},
+                {"$group": {"_id": None, "avg": {"$avg": "$rating"}, "n": {"$sum": 1}}}
+            ],
+            "as": "_rating"
+        }},
+        {"$addFields": {
+            "average_rating": {"$round": [{"$ifNull": [{"$arrayElemAt": ["$_rating.avg", 0]}, 0]}, 1]},
+            "total_reviews": {"$ifNull": [{"$arrayElemAt": ["$_rating.n", 0]}, 0]}
+        }},
+        {"$match": {"average_rating": {"$gt": 0}}},
+        {"$sort": {"average_rating": -1}},
+        {"$limit": 3},
+        {"$project": {"_rating": 0}}
+    ]).to_list(3)
     
     # Fetch data CONCURRENTLY for speed (trials + publications in parallel)
-    import asyncio
-    from concurrent.futures import ThreadPoolExecutor
-    
     def fetch_trials():
         """Fetch trials in thread pool"""
         try:
-            from clinical_trials_api import ClinicalTrialsAPI
-            api_client = ClinicalTrialsAPI()
+            from clinical_trials_api import get_clinical_trials_client
+            api_client = get_clinical_trials_client()
             
             # Use only PRIMARY condition for speed
             primary_condition = patient_conditions[0] if patient_conditions else "cancer"
@@ -4396,8 +4752,8 @@ async def get_patient_overview(
     def fetch_publications():
         """Fetch publications in thread pool"""
         try:
-            from pubmed_api import PubMedAPI
-            api_client = PubMedAPI()
+            from pubmed_api import get_pubmed_client
+            api_client = get_pubmed_client()
             
             # Use only PRIMARY condition for speed
             primary_condition = patient_conditions[0] if patient_conditions else "medicine"
@@ -4418,84 +4774,38 @@ async def get_patient_overview(
             logging.error(f"Failed to fetch publications: {e}")
             return []
     
-    # Execute API calls in PARALLEL using thread pool
+    # Execute API calls in PARALLEL in worker threads (awaited, so the event loop keeps serving)
     start_time = time.time()
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        trials_future = executor.submit(fetch_trials)
-        pubs_future = executor.submit(fetch_publications)
-        
-        trials = trials_future.result()
-        publications = pubs_future.result()
+    trials, publications = await asyncio.gather(
+        asyncio.to_thread(fetch_trials),
+        asyncio.to_thread(fetch_publications)
+    )
     
     fetch_time = time.time() - start_time
     logging.info(f"Parallel API fetch completed in {fetch_time:.2f}s")
     
-    # Score trials by relevance
-    scored_trials = []
-    for trial in trials:
-        score = 60  # Base 60% relevancy for recruiting trials
-        reasons = []
-        
-        # All trials should be recruiting (filtered by API)
-        if trial.get("status", "").lower() == "recruiting":
-            reasons.append("Currently recruiting patients")
-        
-        # Boost if matches patient conditions
-        disease_areas = [area.lower() for area in trial.get("disease_areas", [])]
-        trial_title = trial.get("title", "").lower()
-        trial_desc = trial.get("description", "").lower()
-        
-        for condition in patient_conditions:
-            condition_lower = condition.lower()
-            # Check in disease areas
-            if any(condition_lower in area for area in disease_areas):
-                score += 30
-                reasons.insert(0, f"Researching {condition}")
-                break
-            # Check in title or description
-            elif condition_lower in trial_title or condition_lower in trial_desc:
-                score += 20
-                reasons.insert(0, f"Related to {condition}")
-                break
-        
-        # Add location info
-        if trial.get("location"):
-            reasons.append(f"Location: {trial['location']}")
-        
-        if not reasons:
-            reasons = ["Active clinical trial"]
-        
-        scored_trials.append({
-            **trial,
-            "relevance_score": min(score, 100),
-            "match_reasons": reasons
-        })
-    
-    scored_trials.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-    overview["featured_trials"] = scored_trials[:5]  # Show top 5 instead of 3
+    top_conditions = [(condition, condition.lower()) for condition in patient_conditions[:2]]
     
-    # Score trials quickly
+    # Score trials quickly: only (score, reasons, trial) tuples, then copy just the top 5
     scored_trials = []
     for trial in trials[:15]:  # Process max 15 for speed
         score = 70 if trial.get("status", "").lower() == "recruiting" else 50
         reasons = ["Currently recruiting"]
         
-        # Quick relevance check
-        disease_areas = [area.lower() for area in trial.get("disease_areas", [])]
-        for condition in patient_conditions[:2]:
-            if any(condition.lower() in area for area in disease_areas):
+        # Quick relevance check (one substring scan over the joined areas per condition)
+        disease_areas = AREA_SEPARATOR.join(trial.get("disease_areas", [])).lower()
+        for condition, condition_lower in top_conditions:
+            if disease_areas and condition_lower in disease_areas:
                 score = 95
                 reasons.insert(0, f"Matches {condition}")
                 break
         
-        scored_trials.append({
-            **trial,
-            "relevance_score": score,
-            "match_reasons": reasons[:2]  # Max 2 reasons
-        })
+        scored_trials.append((score, reasons[:2], trial))  # Max 2 reasons
     
-    scored_trials.sort(key=lambda x: x["relevance_score"], reverse=True)
-    overview["featured_trials"] = scored_trials[:5]
+    overview["featured_trials"] = [
+        {**trial, "relevance_score": score, "match_reasons": reasons}
+        for score, reasons, trial in heapq.nlargest(5, scored_trials, key=lambda x: x[0])
+    ]
     
     # Score publications quickly
     scored_pubs = []
@@ -4507,38 +4817,17 @@ async def get_patient_overview(
         
         # Quick relevance check
         pub_title = pub.get("title", "").lower()
-        for condition in patient_conditions[:2]:
-            if condition.lower() in pub_title:
+        for _, condition_lower in top_conditions:
+            if condition_lower in pub_title:
                 score = 95
                 break
         
-        scored_pubs.append({
-            **pub,
-            "relevance_score": score
-        })
-    
-    scored_pubs.sort(key=lambda x: x["relevance_score"], reverse=True)
-    overview["latest_publications"] = scored_pubs[:5]
+        scored_pubs.append((score, pub))
     
-    # Get top researchers (from database - fast)
-    experts = await db.health_experts.find(
-        {"is_platform_member": True}, 
-        {"_id": 0}
-    ).limit(10).to_list(10)
-    
-    # Quick rating calculation
-    for expert in experts[:5]:  # Only process top 5
-        if expert.get("user_id"):
-            reviews = await db.reviews.find(
-                {"researcher_id": expert["user_id"]},
-                {"_id": 0, "rating": 1}
-            ).limit(20).to_list(20)
-            
-            if reviews:
-                expert["average_rating"] = round(sum(r["rating"] for r in reviews) / len(reviews), 1)
-                expert["total_reviews"] = len(reviews)
-    
-    overview["top_researchers"] = [e for e in experts if e.get("average_rating", 0) > 0][:3]
+    overview["latest_publications"] = [
+        {**pub, "relevance_score": score}
+        for score, pub in heapq.nlargest(5, scored_pubs, key=lambda x: x[0])
+    ]
     
     # Cache the result
     overview_cache[cache_key] = overview
@@ -4564,41 +4853,73 @@ async def get_researcher_details(
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    # Get researcher profile
-    researcher = await db.researcher_profiles.find_one({"user_id": researcher_user_id}, {"_id": 0})
-    if not researcher:
-        raise HTTPException(status_code=404, detail="Researcher not found")
-    
-    # Get user info
-    researcher_user = await db.users.find_one({"id": researcher_user_id}, {"_id": 0})
-    
-    # Get their clinical trials
-    trials = await db.clinical_trials.find(
-        {"created_by": researcher_user_id},
-        {"_id": 0}
-    ).to_list(100)
-    
-    # Get publications authored by this researcher
-    # Search by researcher name in authors list
-    researcher_name = researcher.get("name", "")
-    publications = await db.publications.find(
-        {"authors": {"$regex": researcher_name, "$options": "i"}},
-        {"_id": 0}
-    ).to_list(100)
+    # Profile, user, trials, publications and reviews (with the average) in one aggregation
+    result = await db.researcher_profiles.aggregate([
+        {"$match": {"user_id": researcher_user_id}},
+        {"$limit": 1},
+        {"$project": {"_id": 0}},
+        # Get user info
+        {"$lookup": {
+            "from": "users",
+            "let": {"uid": "$user_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$id", "$$uid"]}}},
+                {"$limit": 1},
+                {"$project": {"_id": 0}}
+            ],
+            "as": "_user"
+        }},
+        # Get their clinical trials
+        {"$lookup": {
+            "from": "clinical_trials",
+            "let": {"uid": "$user_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$created_by", "$$uid"]}}},
+                {"$limit": 100},
+                {"$project": {"_id": 0}}
+            ],
+            "as": "_trials"
+        }},
+        # Get publications authored by this researcher: the normalized name is looked up in
+        # the normalized authors array, an equality join served by the authors_norm index
+        {"$addFields": {"_name_norm": {"$toLower": {"$trim": {"input": {"$ifNull": ["$name", ""]}}}}}},
+        {"$lookup": {
+            "from": "publications",
+            "localField": "_name_norm",
+            "foreignField": "authors_norm",
+            "as": "_publications"
+        }},
+        {"$addFields": {"_publications": {"$slice": ["$_publications", 100]}}},
+        {"$project": {"_name_norm": 0, "_publications._id": 0, "_publications.authors_norm": 0}},
+        # Get reviews/ratings
+        {"$lookup": {
+            "from": "reviews",
+            "let": {"uid": "$user_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$researcher_id", "$$uid"]}}},
+                {"$limit": 100},
+                {"$project": {"_id": 0}}
+            ],
+            "as": "_reviews"
+        }},
+        {"$addFields": {
+            "_average_rating": {"$ifNull": [{"$round": [{"$avg": "$_reviews.rating"}, 1]}, 0]}
+        }}
+    ]).to_list(1)
     
-    # Get reviews/ratings
-    reviews = await db.reviews.find(
-        {"researcher_id": researcher_user_id},
-        {"_id": 0}
-    ).to_list(100)
+    if not result:
+        raise HTTPException(status_code=404, detail="Researcher not found")
     
-    avg_rating = 0
-    if reviews:
-        avg_rating = round(sum(r["rating"] for r in reviews) / len(reviews), 1)
+    researcher = result[0]
+    researcher_user = researcher.pop("_user")
+    trials = researcher.pop("_trials")
+    publications = researcher.pop("_publications")
+    reviews = researcher.pop("_reviews")
+    avg_rating = researcher.pop("_average_rating")
     
     return {
         "profile": researcher,
-        "user": researcher_user,
+        "user": researcher_user[0] if researcher_user else None,
         "trials": trials,
         "publications": publications,
         "average_rating": avg_rating,
@@ -4608,7 +4929,9 @@ async def get_researcher_details(
 
 # ============ AskCura AI Treatment Advisor ============
 
-from treatment_advisor import AskCuraAdvisor, create_patient_advisor, create_researcher_advisor
+from treatment_advisor import (
+    AskCuraAdvisor, cap_comparison_items, create_patient_advisor, create_researcher_advisor, load_token_encoder
+)
 
 # Pydantic models for AskCura
 class AskCuraChatMessage(BaseModel):
@@ -4627,16 +4950,24 @@ class ConversationMessage(BaseModel):
     content: str
     timestamp: str
 
-# In-memory advisor instances (session-based)
-active_advisors: Dict[str, AskCuraAdvisor] = {}
+# In-memory advisor instances (session-based), least recently used evicted past the cap
+active_advisors: "OrderedDict[str, AskCuraAdvisor]" = OrderedDict()
+MAX_ACTIVE_ADVISORS = 1000
 
 def get_or_create_advisor(user_id: str, user_role: str, provider: str = "openai") -> AskCuraAdvisor:
-    """Get existing advisor or create new one"""
+    """Get existing advisor (reusing its LlmChat session) or create new one"""
     key = f"{user_id}_{user_role}_{provider}"
-    if key not in active_advisors:
-        role = "patient" if user_role == "patient" else "researcher"
-        active_advisors[key] = AskCuraAdvisor(role=role, provider=provider)
-    return active_advisors[key]
+    advisor = active_advisors.get(key)
+    if advisor is not None:
+        active_advisors.move_to_end(key)
+        return advisor
+    
+    role = "patient" if user_role == "patient" else "researcher"
+    advisor = AskCuraAdvisor(role=role, provider=provider)
+    active_advisors[key] = advisor
+    if len(active_advisors) > MAX_ACTIVE_ADVISORS:
+        active_advisors.popitem(last=False)
+    return advisor
 
 @api_router.post("/askcura/patient/chat")
 async def askcura_patient_chat(
@@ -4770,6 +5101,54 @@ async def compare_treatments(
     
     return comparison
 
+@api_router.post("/askcura/patient/compare-treatments/stream")
+async def stream_compare_treatments(
+    request: TreatmentComparisonRequest,
+    session_token: Optional[str] = Cookie(None),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Treatment comparison streamed as Server-Sent Events (Patient version)
+    Each event's data is a JSON-encoded text chunk; a final "done" event carries the
+    same comparison object the non-streaming endpoint returns. If the LLM call fails
+    (even midway) an "error" event with {"detail": ...} ends the stream instead and
+    nothing is stored.
+    """
+    user = await get_current_user(session_token, authorization)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    advisor = get_or_create_advisor(user.id, "patient", provider="openai")
+    treatments = cap_comparison_items(request.treatments, "treatments")
+    
+    async def events():
+        parts = []
+        try:
+            async for chunk in advisor.stream_treatment_comparison(request.disease, treatments):
+                parts.append(chunk)
+                yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": advisor.error_reply(e)}) + b"\n\n"
+            return
+        
+        comparison = {
+            "disease": request.disease,
+            "treatments": treatments,
+            "comparison": "".join(parts).strip(),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        # Store in database once the full reply is in
+        await db.treatment_comparisons.insert_one({
+            "user_id": user.id,
+            "disease": request.disease,
+            "treatments": treatments,
+            "comparison": comparison,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+        yield b"event: done\ndata: " + orjson.dumps(comparison) + b"\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @api_router.post("/askcura/researcher/compare-protocols")
 async def compare_protocols(
     request: ProtocolComparisonRequest,
@@ -4864,6 +5243,136 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def warm_db_pool():
+    """Open pooled connections up front so first requests don't pay connection setup"""
+    try:
+        await asyncio.gather(*[client.admin.command("ping") for _ in range(MONGO_MIN_POOL_SIZE)])
+        logger.info(f"✅ MongoDB pool warmed with {MONGO_MIN_POOL_SIZE} connections")
+    except Exception as e:
+        logger.error(f"MongoDB pool warm-up failed: {e}")
+
+@app.on_event("startup")
+async def ensure_unique_indexes():
+    """
+    Create the unique indexes request handlers rely on for duplicate rejection, so they
+    exist even where setup_indexes.py was never run (no-op when already present)
+    """
+    try:
+        await db.collaboration_reviews.create_index([("collaboration_id", 1), ("reviewer_id", 1)], unique=True)
+        logger.info("✅ Unique index on collaboration_reviews collaboration_id + reviewer_id ensured")
+    except Exception as e:
+        # Existing duplicates block the index; the handler's existence check still applies
+        logger.error(f"Could not ensure unique collaboration_reviews index: {e}")
+
+# "$changeStream is only supported on replica sets" - the one error that ends the watcher for good
+CHANGE_STREAM_UNSUPPORTED_CODE = 40573
+# ChangeStreamHistoryLost - the resume token fell off the oplog
+CHANGE_STREAM_HISTORY_LOST_CODE = 286
+CHANGE_STREAM_MAX_BACKOFF = 60  # seconds
+
+def drop_prefixed_profiles(prefix: str):
+    """Drop every cached profile whose key starts with prefix"""
+    for key in [k for k in profile_cache if k.startswith(prefix)]:
+        profile_cache.pop(key, None)
+        profile_cache_time.pop(key, None)
+
+def invalidate_all_watched_caches():
+    """Drop everything the change stream keeps fresh (after a gap in the stream)"""
+    invalidate_questions_cache()
+    invalidate_session_cache()
+    drop_prefixed_profiles("researcher_profile_")
+    drop_prefixed_profiles("patient_profile_")
+
+def apply_cache_invalidation(change: dict):
+    """Invalidate the caches affected by one change-stream event"""
+    collection = change["ns"]["coll"]
+    if collection in ("questions", "answers"):
+        invalidate_questions_cache()
+        return
+    
+    if collection in ("users", "user_sessions"):
+        # Revoked sessions and role changes must not stay valid on other workers.
+        # New users/sessions have nothing cached yet.
+        if change["operationType"] == "insert":
+            return
+        doc = change.get("fullDocument")
+        if not doc:
+            # Deleted - the token/user id went with the document, drop all cached auth
+            invalidate_session_cache()
+        elif collection == "users":
+            invalidate_session_cache(user_id=doc.get("id"))
+        else:
+            invalidate_session_cache(token=doc.get("session_token"))
+        return
+    
+    profile = change.get("fullDocument")
+    if profile and profile.get("user_id"):
+        if collection == "patient_profiles":
+            invalidate_patient_profile(profile["user_id"])
+        else:
+            invalidate_researcher_profile(profile["user_id"])
+    else:
+        # Deleted profile - the user_id is gone with the document, drop all entries of that kind
+        drop_prefixed_profiles("patient_profile_" if collection == "patient_profiles" else "researcher_profile_")
+
+async def watch_cache_invalidations():
+    """
+    Invalidate in-process caches from a MongoDB change stream so writes made outside
+    this worker (other workers, scripts, admin edits) are picked up too.
+    Change streams need a replica set; on a standalone server this logs and exits,
+    leaving the handler-side invalidation and TTLs in charge. Any other error
+    reconnects with backoff, resuming after the last event seen.
+    """
+    pipeline = [{"$match": {
+        "ns.coll": {"$in": [
+            "questions", "answers", "researcher_profiles", "patient_profiles", "users", "user_sessions"
+        ]},
+        "operationType": {"$in": ["insert", "update", "replace", "delete"]}
+    }}]
+    resume_token = None
+    backoff = 1
+    while True:
+        try:
+            async with db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                logger.info("✅ Watching questions/answers/profiles/users/user_sessions for cache invalidation")
+                backoff = 1
+                async for change in stream:
+                    apply_cache_invalidation(change)
+                    resume_token = stream.resume_token
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as e:
+            if e.code == CHANGE_STREAM_UNSUPPORTED_CODE:
+                logger.warning(f"Cache invalidation change stream unavailable: {e}")
+                return
+            if e.code == CHANGE_STREAM_HISTORY_LOST_CODE:
+                # Changes were missed - start over and drop whatever may have gone stale
+                resume_token = None
+                invalidate_all_watched_caches()
+            logger.warning(f"Cache invalidation change stream failed, retrying in {backoff}s: {e}")
+        except Exception as e:
+            logger.warning(f"Cache invalidation change stream failed, retrying in {backoff}s: {e}")
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, CHANGE_STREAM_MAX_BACKOFF)
+
+@app.on_event("startup")
+async def warm_token_encoder():
+    """Load AskCura's token encoder before requests need it (the first load may download it)"""
+    await load_token_encoder()
+
+cache_invalidation_task = None
+
+@app.on_event("startup")
+async def start_cache_invalidation_watcher():
+    global cache_invalidation_task
+    cache_invalidation_task = asyncio.create_task(watch_cache_invalidations())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if cache_invalidation_task:
+        cache_invalidation_task.cancel()
+    # Let in-flight background notification writes finish before closing the client
+    if pending_notification_writes:
+        await asyncio.gather(*pending_notification_writes, return_exceptions=True)
     client.close()
\ No newline at end of file
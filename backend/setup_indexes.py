@@ -2,81 +2,469 @@
 Setup MongoDB indexes for optimal forum performance
 Run this script once to create all necessary indexes
 """
+import argparse
 import asyncio
 import os
+import sys
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel
 from dotenv import load_dotenv
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-async def setup_indexes():
-    """Create all necessary indexes for optimal performance"""
+async def find_duplicates(collection, keys):
+    """
+    Group the documents sharing each duplicated key, oldest _id first
+    (documents missing any key field are left out)
+    """
+    return await collection.aggregate([
+        {"$match": {key: {"$exists": True} for key in keys}},
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": {key: f"${key}" for key in keys}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}}
+    ], allowDiskUse=True).to_list(None)
+
+async def check_duplicates(collection, keys, dedupe=False):
+    """
+    Make sure a unique index on keys can build. Duplicates are reported and the step fails;
+    with dedupe=True every document but the oldest per key is deleted instead.
+    Returns the deduplicated keys.
+    """
+    groups = await find_duplicates(collection, keys)
+    if not groups:
+        return []
+    
+    verb = "deleting" if dedupe else "--dedupe would delete"
+    for group in groups:
+        print(f"    {collection.name} {group['_id']}: keeping {group['ids'][0]}, "
+              f"{verb} {', '.join(str(_id) for _id in group['ids'][1:])}")
+    if not dedupe:
+        raise RuntimeError(
+            f"{len(groups)} duplicated {'+'.join(keys)} key(s) in '{collection.name}' - "
+            "resolve them or rerun with --dedupe"
+        )
+    
+    for group in groups:
+        await collection.delete_many({"_id": {"$in": group["ids"][1:]}})
+    return [group["_id"] for group in groups]
+
+async def recompute_vote_counts(db, answer_ids):
+    """Reset answers' likes/dislikes from the votes collection"""
+    counts = {answer_id: {"likes": 0, "dislikes": 0} for answer_id in answer_ids}
+    async for row in db.votes.aggregate([
+        {"$match": {"answer_id": {"$in": list(answer_ids)}}},
+        {"$group": {"_id": {"answer_id": "$answer_id", "vote_type": "$vote_type"}, "count": {"$sum": 1}}}
+    ]):
+        vote_type = row["_id"]["vote_type"]
+        if vote_type in ("like", "dislike"):
+            counts[row["_id"]["answer_id"]][f"{vote_type}s"] = row["count"]
+    for answer_id, answer_counts in counts.items():
+        await db.answers.update_one({"id": answer_id}, {"$set": answer_counts})
+    return len(counts)
+
+async def setup_indexes(dedupe=False):
+    """
+    Create all necessary indexes for optimal performance
+    
+    Every index, duplicate check and backfill is its own step: a failure is reported and the
+    remaining steps still run. Returns the descriptions of the steps that failed.
+    Duplicates blocking a unique index fail their step unless dedupe is set.
+    """
     
     # Connect to MongoDB
     mongo_url = os.environ['MONGO_URL']
     client = AsyncIOMotorClient(mongo_url)
     db = client[os.environ['DB_NAME']]
     
+    failures = []
+    
+    async def step(action, description, name=None):
+        """
+        Await one setup step and print its outcome - description may be a function of
+        the result, in which case name labels the step if it fails
+        """
+        try:
+            result = await action
+        except Exception as e:
+            label = name or description
+            failures.append(f"{label}: {e}")
+            print(f"  ❌ {label} failed: {e}")
+            return None
+        print(f"  ✅ {description if isinstance(description, str) else description(result)}")
+        return result
+    
     print("🔧 Setting up MongoDB indexes for forum optimization...")
     print()
     
     try:
-        # Forums collection indexes
-        print("📋 Creating indexes for 'forums' collection:")
+        # The three forum collections' indexes are built with one createIndexes command per
+        # collection, and the collections are done concurrently
+        forum_indexes = [
+            IndexModel([("created_at", -1)]),  # Efficient sorting (most important)
+            IndexModel([("created_by", 1)]),  # Filtering by creator
+            IndexModel([("category", 1)]),  # Filtering by category
+            IndexModel([("category", 1), ("created_at", -1)])  # Filtered sorting
+        ]
+        posts_indexes = [
+            IndexModel([("forum_id", 1)]),  # Post retrieval by forum
+            IndexModel([("forum_id", 1), ("created_at", -1)]),  # Sorted posts
+            IndexModel([("user_id", 1)])  # User's posts
+        ]
+        memberships_indexes = [
+            IndexModel([("forum_id", 1)]),  # Forum membership queries
+            IndexModel([("user_id", 1)]),  # User's memberships
+            IndexModel([("user_id", 1), ("forum_id", 1)])  # Membership checks
+        ]
+        print("📋 Creating indexes for forum collections:")
+        await asyncio.gather(
+            step(
+                db.forums.create_indexes(forum_indexes),
+                "'forums' indexes on created_at, created_by, category and category + created_at - for sorting and filtering"
+            ),
+            step(
+                db.forum_posts.create_indexes(posts_indexes),
+                "'forum_posts' indexes on forum_id, forum_id + created_at and user_id - for post retrieval"
+            ),
+            step(
+                db.forum_memberships.create_indexes(memberships_indexes),
+                "'forum_memberships' indexes on forum_id, user_id and user_id + forum_id - for membership checks"
+            )
+        )
+        
+        print()
+        
+        # Case-insensitive collation matching CASE_INSENSITIVE_COLLATION in server.py
+        collation = {"locale": "en", "strength": 2}
+        
+        # Exact-term status filter on the trial fallback runs with the case-insensitive collation
+        # (the substring regex filters can't use collation indexes, so they get none)
+        print("🔎 Creating case-insensitive status index:")
+        
+        await step(
+            db.clinical_trials.create_index([("status", 1)], collation=collation),
+            "Index on 'clinical_trials.status' - for exact status matches"
+        )
+        
+        print()
+        
+        # Compound/lookup indexes matching the list endpoints' query shapes
+        print("🧭 Creating compound indexes for list endpoints:")
+        
+        await step(
+            db.publications.create_index([("disease_areas", 1), ("year", -1)]),
+            "Compound index on 'publications' disease_areas + year (descending)"
+        )
+        
+        # Text indexes rank the /search database fallback by relevance when the live APIs are down
+        await step(
+            db.clinical_trials.create_index(
+                [("title", "text"), ("description", "text"), ("disease_areas", "text")],
+                name="clinical_trials_text"
+            ),
+            "Text index on 'clinical_trials' title + description + disease_areas"
+        )
+        
+        await step(
+            db.publications.create_index(
+                [("title", "text"), ("abstract", "text"), ("disease_areas", "text")],
+                name="publications_text"
+            ),
+            "Text index on 'publications' title + abstract + disease_areas"
+        )
+        
+        await step(
+            db.health_experts.create_index([("specialty", 1), ("location", 1), ("user_id", 1)]),
+            "Compound index on 'health_experts' specialty + location + user_id"
+        )
+        
+        await step(
+            db.forum_posts.create_index([("forum_id", 1), ("parent_id", 1), ("created_at", -1)]),
+            "Compound index on 'forum_posts' forum_id + parent_id + created_at - for threads"
+        )
         
-        # Index on created_at for efficient sorting (most important)
-        await db.forums.create_index([("created_at", -1)])
-        print("  ✅ Index on 'created_at' (descending) - for efficient sorting")
+        await step(
+            check_duplicates(db.forum_memberships, ["forum_id", "user_id"], dedupe),
+            lambda keys: f"Checked 'forum_memberships' for duplicates ({len(keys)} deduplicated)",
+            name="Checking 'forum_memberships' for duplicates"
+        )
+        await step(
+            db.forum_memberships.create_index([("forum_id", 1), ("user_id", 1)], unique=True),
+            "Unique index on 'forum_memberships' forum_id + user_id"
+        )
         
-        # Index on created_by for filtering by user
-        await db.forums.create_index([("created_by", 1)])
-        print("  ✅ Index on 'created_by' - for filtering forums by creator")
+        # Covers rating-only lookups ({"_id": 0, "rating": 1}) without fetching documents
+        await step(
+            db.reviews.create_index([("researcher_id", 1), ("rating", 1)]),
+            "Compound index on 'reviews' researcher_id + rating - covered rating lookups"
+        )
         
-        # Index on category for filtering by category
-        await db.forums.create_index([("category", 1)])
-        print("  ✅ Index on 'category' - for filtering forums by category")
+        await step(
+            check_duplicates(db.researcher_profiles, ["user_id"], dedupe),
+            lambda keys: f"Checked 'researcher_profiles' for duplicates ({len(keys)} deduplicated)",
+            name="Checking 'researcher_profiles' for duplicates"
+        )
+        await step(
+            db.researcher_profiles.create_index([("user_id", 1)], unique=True),
+            "Unique index on 'researcher_profiles.user_id'"
+        )
         
-        # Compound index on category and created_at for combined queries
-        await db.forums.create_index([("category", 1), ("created_at", -1)])
-        print("  ✅ Compound index on 'category' + 'created_at' - for filtered sorting")
+        await step(
+            db.researcher_profiles.create_index([("specialty_tokens", 1)]),
+            "Index on 'researcher_profiles.specialty_tokens' - for specialty/forum matching"
+        )
+        
+        await step(
+            check_duplicates(db.users, ["id"], dedupe),
+            lambda keys: f"Checked 'users' for duplicates ({len(keys)} deduplicated)",
+            name="Checking 'users' for duplicates"
+        )
+        await step(
+            db.users.create_index([("id", 1)], unique=True),
+            "Unique index on 'users.id' - for session/user lookups"
+        )
         
         print()
         
-        # Forum posts collection indexes
-        print("📝 Creating indexes for 'forum_posts' collection:")
+        # Q&A collections
+        print("💬 Creating indexes for Q&A collections:")
+        
+        await step(
+            db.answers.create_index([("question_id", 1), ("parent_id", 1)]),
+            "Compound index on 'answers' question_id + parent_id - for answer counts"
+        )
+        
+        await step(
+            db.answers.create_index([("question_id", 1), ("parent_id", 1), ("created_at", 1)]),
+            "Compound index on 'answers' question_id + parent_id + created_at - for sorted replies"
+        )
+        
+        await step(
+            db.votes.create_index([("user_id", 1), ("answer_id", 1)]),
+            "Compound index on 'votes' user_id + answer_id - for page-scoped vote lookups"
+        )
         
-        # Index on forum_id for efficient post retrieval by forum
-        await db.forum_posts.create_index([("forum_id", 1)])
-        print("  ✅ Index on 'forum_id' - for efficient post retrieval")
+        deduped_votes = await step(
+            check_duplicates(db.votes, ["answer_id", "user_id"], dedupe),
+            lambda keys: f"Checked 'votes' for duplicates ({len(keys)} deduplicated)",
+            name="Checking 'votes' for duplicates"
+        )
+        if deduped_votes:
+            # Deleted votes were counted in their answers' likes/dislikes
+            await step(
+                recompute_vote_counts(db, {key["answer_id"] for key in deduped_votes}),
+                lambda count: f"Recomputed likes/dislikes on {count} answers",
+                name="Recomputing likes/dislikes on answers"
+            )
+        await step(
+            db.votes.create_index([("answer_id", 1), ("user_id", 1)], unique=True),
+            "Unique index on 'votes' answer_id + user_id - one vote per user per answer"
+        )
         
-        # Compound index on forum_id and created_at for sorted posts
-        await db.forum_posts.create_index([("forum_id", 1), ("created_at", -1)])
-        print("  ✅ Compound index on 'forum_id' + 'created_at' - for sorted posts")
+        # Backfill the lowercased condition used by the question list filter
+        await step(
+            db.questions.update_many(
+                {"condition_lc": {"$exists": False}, "condition": {"$type": "string"}},
+                [{"$set": {"condition_lc": {"$toLower": "$condition"}}}]
+            ),
+            lambda result: f"Backfilled 'condition_lc' on {result.modified_count} questions",
+            name="Backfilling 'condition_lc' on questions"
+        )
         
-        # Index on user_id for user's posts
-        await db.forum_posts.create_index([("user_id", 1)])
-        print("  ✅ Index on 'user_id' - for user's posts")
+        await step(
+            db.questions.create_index([("condition_lc", 1), ("created_at", -1)]),
+            "Compound index on 'questions' condition_lc + created_at - for anchored prefix filtering"
+        )
         
         print()
         
-        # Forum memberships collection indexes
-        print("👥 Creating indexes for 'forum_memberships' collection:")
+        # Favorites, appointments and collaborations
+        print("🤝 Creating indexes for favorites, appointments and collaborations:")
+        
+        await step(
+            check_duplicates(db.favorites, ["user_id", "item_type", "item_id"], dedupe),
+            lambda keys: f"Checked 'favorites' for duplicates ({len(keys)} deduplicated)",
+            name="Checking 'favorites' for duplicates"
+        )
+        await step(
+            db.favorites.create_index([("user_id", 1), ("item_type", 1), ("item_id", 1)], unique=True),
+            "Unique index on 'favorites' user_id + item_type + item_id"
+        )
+        
+        await step(
+            db.appointments.create_index([("patient_id", 1), ("created_at", -1)]),
+            "Compound index on 'appointments' patient_id + created_at"
+        )
+        
+        await step(
+            db.appointments.create_index([("researcher_id", 1), ("created_at", -1)]),
+            "Compound index on 'appointments' researcher_id + created_at"
+        )
         
-        # Index on forum_id for efficient membership queries
-        await db.forum_memberships.create_index([("forum_id", 1)])
-        print("  ✅ Index on 'forum_id' - for forum membership queries")
+        await step(
+            db.collaboration_requests.create_index([("receiver_id", 1), ("status", 1)]),
+            "Compound index on 'collaboration_requests' receiver_id + status"
+        )
         
-        # Index on user_id for user's memberships
-        await db.forum_memberships.create_index([("user_id", 1)])
-        print("  ✅ Index on 'user_id' - for user's memberships")
+        await step(
+            db.collaborations.create_index([("researcher1_id", 1), ("status", 1)]),
+            "Compound index on 'collaborations' researcher1_id + status"
+        )
         
-        # Compound index on user_id and forum_id for checking membership
-        await db.forum_memberships.create_index([("user_id", 1), ("forum_id", 1)])
-        print("  ✅ Compound index on 'user_id' + 'forum_id' - for membership checks")
+        await step(
+            db.collaborations.create_index([("researcher2_id", 1), ("status", 1)]),
+            "Compound index on 'collaborations' researcher2_id + status"
+        )
         
         print()
+        
+        # Reviews and chat
+        print("⭐ Creating indexes for reviews and chat:")
+        
+        await step(
+            check_duplicates(db.collaboration_reviews, ["collaboration_id", "reviewer_id"], dedupe),
+            lambda keys: f"Checked 'collaboration_reviews' for duplicates ({len(keys)} deduplicated)",
+            name="Checking 'collaboration_reviews' for duplicates"
+        )
+        await step(
+            db.collaboration_reviews.create_index([("collaboration_id", 1), ("reviewer_id", 1)], unique=True),
+            "Unique index on 'collaboration_reviews' collaboration_id + reviewer_id - one review per collaborator"
+        )
+        
+        await step(
+            db.clinical_trials.create_index([("created_by", 1), ("created_at", -1)]),
+            "Compound index on 'clinical_trials' created_by + created_at - for a researcher's own trials"
+        )
+        
+        await step(
+            db.reviews.create_index([("researcher_id", 1), ("created_at", -1)]),
+            "Compound index on 'reviews' researcher_id + created_at - for latest-first listings"
+        )
+        
+        await step(
+            db.chat_rooms.create_index([("patient_id", 1), ("status", 1)]),
+            "Compound index on 'chat_rooms' patient_id + status"
+        )
+        
+        await step(
+            db.chat_rooms.create_index([("researcher_id", 1), ("status", 1)]),
+            "Compound index on 'chat_rooms' researcher_id + status"
+        )
+        
+        await step(
+            check_duplicates(db.appointments, ["id"], dedupe),
+            lambda keys: f"Checked 'appointments' for duplicates ({len(keys)} deduplicated)",
+            name="Checking 'appointments' for duplicates"
+        )
+        await step(
+            db.appointments.create_index([("id", 1)], unique=True),
+            "Unique index on 'appointments.id' - for chat room lookups"
+        )
+        
+        await step(
+            db.collaboration_messages.create_index([("collaboration_id", 1), ("created_at", 1)]),
+            "Compound index on 'collaboration_messages' collaboration_id + created_at - for in-order message history"
+        )
+        
+        await step(
+            db.chat_messages.create_index([("chat_room_id", 1), ("created_at", 1)]),
+            "Compound index on 'chat_messages' chat_room_id + created_at - for in-order message history"
+        )
+        
+        await step(
+            db.notifications.create_index([("user_id", 1), ("created_at", -1)]),
+            "Compound index on 'notifications' user_id + created_at - for latest-first notifications"
+        )
+        
+        await step(
+            db.notifications.create_index(
+                [("user_id", 1)],
+                partialFilterExpression={"read": False},
+                name="unread_by_user"
+            ),
+            "Partial index on 'notifications.user_id' (unread only) - for unread counts"
+        )
+        
+        print()
+        
+        # Normalized author names let researcher details find publications with an indexed equality match
+        print("📚 Backfilling normalized author names on publications:")
+        
+        await step(
+            db.publications.update_many(
+                {"authors_norm": {"$exists": False}},
+                [{"$set": {"authors_norm": {"$map": {
+                    "input": {"$ifNull": ["$authors", []]},
+                    "in": {"$toLower": {"$trim": {"input": "$$this"}}}
+                }}}}]
+            ),
+            lambda result: f"Backfilled 'authors_norm' on {result.modified_count} publications",
+            name="Backfilling 'authors_norm' on publications"
+        )
+        
+        await step(
+            db.publications.create_index([("authors_norm", 1)]),
+            "Index on 'publications.authors_norm' - for researcher publication lookups"
+        )
+        
+        print()
+        
+        # Lowercased expert fields scored by search; backfill experts saved before they existed
+        print("🔎 Backfilling lowercased search fields on health experts:")
+        
+        await step(
+            db.health_experts.update_many(
+                {"specialty_lc": {"$exists": False}},
+                [{"$set": {
+                    "name_lc": {"$toLower": {"$ifNull": ["$name", ""]}},
+                    "specialty_lc": {"$toLower": {"$ifNull": ["$specialty", ""]}},
+                    "bio_lc": {"$toLower": {"$ifNull": ["$bio", ""]}},
+                    "research_areas_lc": {"$map": {
+                        "input": {"$ifNull": ["$research_areas", []]},
+                        "in": {"$toLower": "$$this"}
+                    }}
+                }}]
+            ),
+            lambda result: f"Backfilled search fields on {result.modified_count} experts",
+            name="Backfilling search fields on experts"
+        )
+        
+        print()
+        
+        # Legacy documents may hold BSON dates; the API stores and returns ISO strings,
+        # so convert them server-side with an aggregation-pipeline update
+        print("🕒 Normalizing legacy date fields to ISO strings:")
+        
+        date_fields = {
+            "appointments": ["created_at"],
+            "forum_memberships": ["joined_at"],
+            "forums": ["created_at"],
+            "clinical_trials": ["created_at"],
+            "reviews": ["created_at"],
+            "collaborations": ["created_at", "ended_at"],
+        }
+        for collection_name, fields in date_fields.items():
+            for field in fields:
+                await step(
+                    db[collection_name].update_many(
+                        {field: {"$type": "date"}},
+                        [{"$set": {field: {"$dateToString": {
+                            "date": f"${field}",
+                            "format": "%Y-%m-%dT%H:%M:%S.%L+00:00"
+                        }}}}]
+                    ),
+                    lambda result: f"{collection_name}.{field}: converted {result.modified_count} documents",
+                    name=f"Converting {collection_name}.{field}"
+                )
+        
+        print()
+        if failures:
+            print(f"❌ {len(failures)} step(s) failed (all other steps completed):")
+            for failure in failures:
+                print(f"  • {failure}")
+            return failures
+        
         print("✅ All indexes created successfully!")
         print()
         print("📊 Performance improvements:")
@@ -85,12 +473,17 @@ async def setup_indexes():
         print("  • Forum deletion: Fast cascading deletes")
         print("  • Post retrieval: Instant loading by forum")
         print("  • Membership checks: Sub-millisecond queries")
+        return failures
         
-    except Exception as e:
-        print(f"❌ Error creating indexes: {str(e)}")
-        raise
     finally:
         client.close()
 
 if __name__ == "__main__":
-    asyncio.run(setup_indexes())
+    parser = argparse.ArgumentParser(description="Create the MongoDB indexes")
+    parser.add_argument(
+        "--dedupe", action="store_true",
+        help="delete all but the oldest document per duplicated unique-index key"
+    )
+    args = parser.parse_args()
+    if asyncio.run(setup_indexes(dedupe=args.dedupe)):
+        sys.exit(1)
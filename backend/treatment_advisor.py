@@ -9,19 +9,159 @@ Uses OpenAI GPT-5 and Gemini 2.5 Pro via emergentintegrations library
 """
 
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
 import os
+import time
+import weakref
+from pathlib import Path
 from dotenv import load_dotenv
-import uuid
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 from datetime import datetime, timezone
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get the Emergent LLM key
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
 
+# Direct OpenAI client (streaming and the Batch API) - created on first use, only with a key
+OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+openai_client = None
+
+def get_openai_client():
+    """Get or create the shared AsyncOpenAI client (None when OPENAI_API_KEY isn't set)"""
+    global openai_client
+    if openai_client is None and OPENAI_API_KEY:
+        from openai import AsyncOpenAI
+        openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return openai_client
+
+# Session ids only need to be unique per worker: pid prefix + per-process counter
+# (the pid is read per advisor, so workers forked after import still differ)
+session_counter = itertools.count()
+
+# Max comparison LLM calls in flight at once for compare_many (provider rate limits)
+MAX_CONCURRENT_COMPARISONS = int(os.environ.get('ASKCURA_MAX_CONCURRENCY', '10'))
+
+# Requests per minute allowed to each provider (shapes bursts instead of hitting 429s)
+OPENAI_RPM = int(os.environ.get('OPENAI_RPM', '500'))
+GEMINI_RPM = int(os.environ.get('GEMINI_RPM', '150'))
+
+# Input caps: tokens of user input per message (a comparison's condition gets half, its
+# treatments/protocols share the other half), and treatments/protocols per comparison
+MAX_INPUT_TOKENS = int(os.environ.get('ASKCURA_MAX_INPUT_TOKENS', '2048'))
+MAX_COMPARISON_ITEMS = int(os.environ.get('ASKCURA_MAX_COMPARISON_ITEMS', '10'))
+
+# tiktoken encoder - loaded off the event loop by load_token_encoder (loading the BPE
+# file can hit the network)
+token_encoder = None
+
+def get_token_encoder():
+    """Get or create the shared tiktoken encoder (None if tiktoken can't load one) - blocking"""
+    global token_encoder
+    if token_encoder is None:
+        try:
+            import tiktoken
+            try:
+                token_encoder = tiktoken.encoding_for_model("gpt-4o")
+            except KeyError:
+                token_encoder = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            logger.error(f"Token encoder unavailable, AskCura input is not truncated: {e}")
+            token_encoder = False
+    return token_encoder or None
+
+
+async def load_token_encoder():
+    """Load the token encoder in a worker thread (called at startup; no-op once loaded)"""
+    if token_encoder is None:
+        await asyncio.to_thread(get_token_encoder)
+
+
+def truncate_message(message: str, max_tokens: int = MAX_INPUT_TOKENS) -> str:
+    """
+    Cut user input down to max_tokens tokens so one oversized query can't blow up latency
+    and cost (left as is until load_token_encoder has run)
+    """
+    if not token_encoder:
+        return message
+    tokens = token_encoder.encode(message)
+    if len(tokens) <= max_tokens:
+        return message
+    logger.warning(f"AskCura input truncated from {len(tokens)} to {max_tokens} tokens")
+    return token_encoder.decode(tokens[:max_tokens])
+
+
+def truncate_comparison_fields(subject: str, items: List[str]) -> Tuple[str, List[str]]:
+    """
+    Truncate a comparison's user-supplied condition and treatments/protocols before they
+    go into a prompt template, so the template's own instructions are never cut off
+    """
+    item_tokens = max(1, MAX_INPUT_TOKENS // 2 // max(1, len(items)))
+    return (
+        truncate_message(subject, MAX_INPUT_TOKENS // 2),
+        [truncate_message(item, item_tokens) for item in items]
+    )
+
+
+def cap_comparison_items(items: List[str], label: str) -> List[str]:
+    """First MAX_COMPARISON_ITEMS treatments/protocols of a comparison request"""
+    if len(items) <= MAX_COMPARISON_ITEMS:
+        return items
+    logger.warning(f"AskCura comparison capped from {len(items)} to {MAX_COMPARISON_ITEMS} {label}")
+    return items[:MAX_COMPARISON_ITEMS]
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter: refills at rate_per_minute / 60 tokens per second up
+    to burst_seconds worth of tokens; acquire() waits for a token (callers are served in order)
+    """
+    
+    def __init__(self, rate_per_minute: int, burst_seconds: float = 2.0):
+        self.rate = rate_per_minute / 60.0
+        # Small burst allowance, so a cold worker can't fire a minute's quota at once
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request may be sent, then take its token"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+rate_limiters = {
+    "openai": TokenBucket(OPENAI_RPM),
+    "gemini": TokenBucket(GEMINI_RPM)
+}
+
+
+def is_rate_limit_error(e: BaseException) -> bool:
+    """
+    Whether a provider error is a 429 / rate limit (worth retrying after a backoff) -
+    openai and litellm both raise a RateLimitError carrying status_code 429
+    """
+    return type(e).__name__ == "RateLimitError" or getattr(e, "status_code", None) == 429
+
 # System messages for different advisor types
+# Kept as byte-identical constants (never formatted per user or instance) so every request
+# shares the same prompt prefix - providers with automatic prefix caching can reuse it
 PATIENT_SYSTEM_MESSAGE = """You are AskCura Treatment Advisor, a friendly AI assistant helping patients understand their treatment options.
 
 Your role:
@@ -61,6 +201,152 @@ When comparing protocols:
 
 Provide scientific rigor while being concise and actionable."""
 
+# Role -> system message, provider -> (provider, model) - looked up once per advisor
+SYSTEM_MESSAGES = {
+    "patient": PATIENT_SYSTEM_MESSAGE,
+    "researcher": RESEARCHER_SYSTEM_MESSAGE
+}
+PROVIDER_MODELS = {
+    "openai": ("openai", "gpt-4o"),
+    "gemini": ("gemini", "gemini-2.5-pro")
+}
+
+# Comparison prompt templates (filled with str.format per call)
+TREATMENT_COMPARISON_PROMPT = """Compare these treatments for {disease} in simple terms:
+{treatments}
+
+For each treatment, briefly explain:
+1. How effective is it?
+2. Common side effects
+3. Cost range
+4. Daily life impact
+5. Treatment duration
+
+Keep response clear and under 400 words."""
+
+PROTOCOL_COMPARISON_PROMPT = """Compare these treatment protocols for {condition} concisely:
+{protocols}
+
+For each protocol, provide:
+1. Efficacy: Response rates, survival metrics
+2. Toxicity: Key adverse events
+3. Biomarkers: Molecular targets
+4. Trial Data: Key trials and endpoints
+
+Keep response under 500 words. Be specific and evidence-based."""
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different inputs share a cache key"""
+    return " ".join(text.split()).lower()
+
+
+def build_treatment_comparison_prompt(disease: str, treatments: List[str]) -> str:
+    """Patient treatment-comparison prompt (shared by live calls and the Batch API)"""
+    return TREATMENT_COMPARISON_PROMPT.format(disease=disease, treatments=", ".join(treatments))
+
+
+def treatment_comparison_cache_text(disease: str, treatments: List[str]) -> str:
+    """Normalized cache text for a treatment comparison (casing, spacing and order don't change the answer)"""
+    norm_treatments = sorted(normalize_text(t) for t in treatments)
+    return f"treatments for {normalize_text(disease)}: {', '.join(norm_treatments)}"
+
+
+def build_protocol_comparison_prompt(condition: str, protocols: List[str]) -> str:
+    """Researcher protocol-comparison prompt"""
+    return PROTOCOL_COMPARISON_PROMPT.format(condition=condition, protocols=", ".join(protocols))
+
+
+class ExactMatchCache:
+    """
+    Cache of advisor responses keyed by a SHA-256 hash of everything that shapes the
+    reply (role, provider, model, system message and prompt)
+
+    Two tiers: an in-process dict (L1) in front of an optional SQLite-backed diskcache
+    (L2) that survives restarts and redeploys on the same host. Both expire an entry
+    ttl seconds after it was stored. L2 problems only ever degrade to L1-only caching.
+    """
+    
+    def __init__(
+        self,
+        ttl: int = 3600,
+        max_size: int = 1000,
+        disk_dir: Optional[str] = None,
+        disk_size_limit: int = 1 << 30
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.responses: Dict[str, str] = {}
+        self.response_times: Dict[str, float] = {}
+        # Weak values: a key's lock lives exactly as long as someone holds or waits on it
+        self.locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self.disk = None
+        if disk_dir:
+            try:
+                import diskcache
+                self.disk = diskcache.Cache(disk_dir, size_limit=disk_size_limit)
+            except Exception as e:
+                logger.error(f"AskCura disk cache unavailable, using memory only: {e}")
+    
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Canonical hash of the key parts (order-independent)"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Cached response if present and not expired (memory first, then disk)"""
+        if key in self.responses and time.time() - self.response_times.get(key, 0) < self.ttl:
+            return self.responses[key]
+        
+        if self.disk is not None:
+            try:
+                response, expire_time = self.disk.get(key, expire_time=True)
+            except Exception as e:
+                logger.error(f"AskCura disk cache read failed: {e}")
+                return None
+            if response is not None:
+                # Keep the original store time so the memory copy expires with the disk one
+                self.set_memory(key, response, stored_at=expire_time - self.ttl if expire_time else None)
+                return response
+        return None
+    
+    def set(self, key: str, response: str):
+        """Cache a response in memory and on disk"""
+        self.set_memory(key, response)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, response, expire=self.ttl)
+            except Exception as e:
+                logger.error(f"AskCura disk cache write failed: {e}")
+    
+    def set_memory(self, key: str, response: str, stored_at: Optional[float] = None):
+        """Cache a response in memory (stored now unless stored_at is given), evicting the oldest entry once full"""
+        self.responses.pop(key, None)
+        if len(self.responses) >= self.max_size:
+            oldest_key = next(iter(self.responses))
+            self.responses.pop(oldest_key, None)
+            self.response_times.pop(oldest_key, None)
+        self.responses[key] = response
+        self.response_times[key] = stored_at if stored_at is not None else time.time()
+    
+    def lock(self, key: str) -> asyncio.Lock:
+        """Per-key lock so concurrent misses for the same prompt make one LLM call"""
+        lock = self.locks.get(key)
+        if lock is None:
+            lock = self.locks[key] = asyncio.Lock()
+        return lock
+
+
+# Shared by every advisor instance (advisors are per user, identical prompts are not)
+response_cache = ExactMatchCache(
+    ttl=3600,
+    # Outside the source tree by default (user cache dir)
+    disk_dir=os.environ.get(
+        'ASKCURA_CACHE_DIR',
+        str(Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'askcura')
+    )
+)
+
 
 class AskCuraAdvisor:
     """AI advisor for treatment and protocol guidance"""
@@ -74,50 +360,188 @@ class AskCuraAdvisor:
             provider: "openai" or "gemini"
         """
         self.role = role
-        self.provider = provider
+        # Unknown providers fall back to OpenAI GPT-4o (more stable than gpt-5)
+        self.provider, self.model = PROVIDER_MODELS.get(provider, PROVIDER_MODELS["openai"])
         
-        # Select system message based on role
-        system_message = PATIENT_SYSTEM_MESSAGE if role == "patient" else RESEARCHER_SYSTEM_MESSAGE
+        # Select system message based on role (anything but "patient" gets the researcher one)
+        self.system_message = SYSTEM_MESSAGES.get(role, RESEARCHER_SYSTEM_MESSAGE)
         
-        # Create LLM chat instance
-        self.chat = LlmChat(
+        # Create LLM chat instance (holds this user's conversation history)
+        self.chat = self.new_chat()
+    
+    def new_chat(self) -> LlmChat:
+        """Fresh LLM chat session with just the system message (no history)"""
+        chat = LlmChat(
             api_key=EMERGENT_LLM_KEY,
-            session_id=f"askcura-{role}-{uuid.uuid4().hex[:8]}",
-            system_message=system_message
+            session_id=f"askcura-{self.role}-{os.getpid():x}-{next(session_counter):x}",
+            system_message=self.system_message
         )
+        chat.with_model(self.provider, self.model)
+        return chat
+    
+    @retry(
+        retry=retry_if_exception(is_rate_limit_error),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def ask_llm(self, message: str, stateless: bool = False) -> str:
+        """
+        Send one message to the LLM (raises on failure)
+        Paced by the provider's token bucket; rate-limit errors are retried with backoff
         
-        # Configure model based on provider
-        if provider == "openai":
-            self.chat.with_model("openai", "gpt-4o")
-        elif provider == "gemini":
-            self.chat.with_model("gemini", "gemini-2.5-pro")
-        else:
-            # Default to OpenAI GPT-4o (more stable than gpt-5)
-            self.chat.with_model("openai", "gpt-4o")
+        Args:
+            message: Prompt to send
+            stateless: Send it in a one-off session instead of the user's chat, so the
+                reply can't draw on (or add to) their conversation history
+        """
+        await rate_limiters[self.provider].acquire()
+        chat = self.new_chat() if stateless else self.chat
+        user_message = UserMessage(text=message)
+        response = await chat.send_message(user_message)
+        return str(response).strip()
+    
+    def response_cache_key(self, message: str, cache_text: Optional[str] = None) -> str:
+        """Exact-match cache key for a prompt (keyed on cache_text if given)"""
+        return response_cache.make_key(
+            role=self.role,
+            provider=self.provider,
+            model=self.model,
+            system=self.system_message,
+            msg=cache_text if cache_text is not None else message
+        )
     
-    async def send_message(self, message: str) -> str:
+    async def ask_llm_cached(self, message: str, cache_text: Optional[str] = None) -> str:
+        """
+        Stateless ask_llm through the shared exact-match response cache (keyed on
+        cache_text if given) - cached replies are served to every user, so they must
+        never depend on one user's chat history
+        """
+        key = self.response_cache_key(message, cache_text)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        async with response_cache.lock(key):
+            # Another caller may have filled it while we waited
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+            response = await self.ask_llm(message, stateless=True)
+            if response:
+                response_cache.set(key, response)
+            return response
+    
+    async def send_message(self, message: str, use_cache: bool = False, cache_text: Optional[str] = None) -> str:
         """
         Send a message to the advisor and get a response
         
         Args:
             message: User message
+            use_cache: Reuse the response to an identical prompt (only for
+                self-contained prompts - these are sent without the chat history,
+                while chat turns depend on the conversation so far). Such prompts
+                are sent as built; chat turns are truncated to MAX_INPUT_TOKENS.
+            cache_text: Normalized description of the request to cache on instead of the
+                raw prompt (only with use_cache)
             
         Returns:
             AI response
         """
         try:
-            user_message = UserMessage(text=message)
-            response = await self.chat.send_message(user_message)
-            return str(response).strip()
+            if use_cache:
+                return await self.ask_llm_cached(message, cache_text)
+            await load_token_encoder()
+            return await self.ask_llm(truncate_message(message))
         except Exception as e:
-            error_msg = str(e)
-            # Provide more helpful error messages
-            if "502" in error_msg or "timeout" in error_msg.lower():
-                return "I apologize, but the AI service is currently experiencing high demand. Please try again in a moment with a shorter query, or try the chat feature instead of comparison mode."
-            elif "rate limit" in error_msg.lower():
-                return "I apologize, but we've reached our rate limit. Please wait a moment and try again."
-            else:
-                return f"I apologize, but I encountered an error: {error_msg}. Please try again with a simpler query."
+            return self.error_reply(e)
+    
+    @staticmethod
+    def error_reply(e: Exception) -> str:
+        """User-facing apology for a failed LLM call"""
+        error_msg = str(e)
+        # Provide more helpful error messages
+        if "502" in error_msg or "timeout" in error_msg.lower():
+            return "I apologize, but the AI service is currently experiencing high demand. Please try again in a moment with a shorter query, or try the chat feature instead of comparison mode."
+        elif is_rate_limit_error(e):
+            return "I apologize, but we've reached our rate limit. Please wait a moment and try again."
+        else:
+            return f"I apologize, but I encountered an error: {error_msg}. Please try again with a simpler query."
+    
+    async def stream_message(self, message: str, cache_text: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream the reply to a self-contained prompt chunk by chunk
+        
+        Streams straight from OpenAI when OPENAI_API_KEY is set (the prompt goes out with
+        just the system message - chat history isn't included, so this is for comparison
+        prompts, not chat turns). Otherwise, or on a cache hit, the whole reply arrives as
+        one chunk. Completed replies are written to the response cache.
+        
+        Args:
+            message: Prompt to send (built from already truncated fields)
+            cache_text: Normalized description of the request to cache on
+            
+        Yields:
+            Reply text chunks
+        
+        Raises:
+            Exception: The LLM call failed (possibly after some chunks were yielded) -
+                callers decide how to report it, see error_reply
+        """
+        client = get_openai_client()
+        if client is None or self.provider != "openai":
+            yield await self.ask_llm_cached(message, cache_text)
+            return
+        
+        key = self.response_cache_key(message, cache_text)
+        cached = response_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        try:
+            await rate_limiters["openai"].acquire()
+            stream = await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self.system_message},
+                    {"role": "user", "content": message}
+                ],
+                stream=True,
+                # Final chunk reports usage, including how much of the prompt prefix the
+                # provider served from its prompt cache
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+                if chunk.usage:
+                    details = chunk.usage.prompt_tokens_details
+                    cached_tokens = (details.cached_tokens or 0) if details else 0
+                    logger.info(
+                        f"AskCura {self.role} prompt: {chunk.usage.prompt_tokens} tokens, {cached_tokens} from prompt cache"
+                    )
+        except Exception as e:
+            logger.error(f"Streaming AskCura reply failed: {e}")
+            raise
+        
+        response = "".join(parts).strip()
+        if response:
+            response_cache.set(key, response)
+    
+    async def stream_treatment_comparison(self, disease: str, treatments: List[str]) -> AsyncIterator[str]:
+        """get_treatment_comparison's reply text, streamed chunk by chunk (Patient version)"""
+        if self.role != "patient":
+            raise ValueError("Treatment comparisons are only available for patient advisors")
+        
+        await load_token_encoder()
+        disease, treatments = truncate_comparison_fields(disease, cap_comparison_items(treatments, "treatments"))
+        prompt = build_treatment_comparison_prompt(disease, treatments)
+        async for chunk in self.stream_message(prompt, treatment_comparison_cache_text(disease, treatments)):
+            yield chunk
     
     async def get_treatment_comparison(self, disease: str, treatments: List[str]) -> Dict[str, Any]:
         """
@@ -133,20 +557,14 @@ class AskCuraAdvisor:
         if self.role != "patient":
             return {"error": "This method is only available for patient advisors"}
         
-        treatments_str = ", ".join(treatments)
-        prompt = f"""Compare these treatments for {disease} in simple terms:
-{treatments_str}
-
-For each treatment, briefly explain:
-1. How effective is it?
-2. Common side effects
-3. Cost range
-4. Daily life impact
-5. Treatment duration
-
-Keep response clear and under 400 words."""
-
-        response = await self.send_message(prompt)
+        await load_token_encoder()
+        disease, treatments = truncate_comparison_fields(disease, cap_comparison_items(treatments, "treatments"))
+        prompt = build_treatment_comparison_prompt(disease, treatments)
+        
+        # Cache on the normalized inputs (exact match only - a near-miss could be advice for a
+        # different disease or regimen). The LLM still sees the user's original wording.
+        cache_text = treatment_comparison_cache_text(disease, treatments)
+        response = await self.send_message(prompt, use_cache=True, cache_text=cache_text)
         
         return {
             "disease": disease,
@@ -155,6 +573,107 @@ Keep response clear and under 400 words."""
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
+    async def compare_many(self, items: List[Tuple[str, List[str]]]) -> List[Any]:
+        """
+        Run several treatment comparisons concurrently (Patient version)
+        
+        Args:
+            items: (disease, treatments) pairs
+            
+        Returns:
+            One comparison dict per item, in order (or the exception that item raised)
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMPARISONS)
+        
+        async def compare(disease: str, treatments: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_treatment_comparison(disease, treatments)
+        
+        return await asyncio.gather(
+            *(compare(disease, treatments) for disease, treatments in items),
+            return_exceptions=True
+        )
+    
+    async def submit_batch(self, items: List[Tuple[str, List[str]]]) -> str:
+        """
+        Queue treatment comparisons on the OpenAI Batch API (24h window, half the token
+        price) for offline bulk work - nothing interactive should wait on this
+        
+        Args:
+            items: (disease, treatments) pairs
+            
+        Returns:
+            Batch id to pass to fetch_batch
+        """
+        if self.role != "patient":
+            raise ValueError("Treatment comparisons are only available for patient advisors")
+        client = get_openai_client()
+        if client is None or self.provider != "openai":
+            raise RuntimeError("The Batch API needs OPENAI_API_KEY and an OpenAI advisor")
+        
+        await load_token_encoder()
+        lines = [
+            json.dumps({
+                "custom_id": f"comparison-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": self.system_message},
+                        {"role": "user", "content": build_treatment_comparison_prompt(
+                            *truncate_comparison_fields(disease, cap_comparison_items(treatments, "treatments"))
+                        )}
+                    ]
+                }
+            })
+            for i, (disease, treatments) in enumerate(items)
+        ]
+        batch_file = await client.files.create(
+            file=("treatment_comparisons.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    async def fetch_batch(self, batch_id: str) -> Optional[List[Optional[str]]]:
+        """
+        Collect the results of a submit_batch job
+        
+        Args:
+            batch_id: Id returned by submit_batch
+            
+        Returns:
+            None while the batch is still running, otherwise one comparison text per
+            submitted item in order (None for items that failed)
+        """
+        client = get_openai_client()
+        if client is None:
+            raise RuntimeError("The Batch API needs OPENAI_API_KEY")
+        
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            return None
+        
+        results: Dict[int, Optional[str]] = {}
+        if batch.output_file_id:
+            output = await client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                index = int(row["custom_id"].rsplit("-", 1)[1])
+                body = (row.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or []
+                results[index] = choices[0]["message"]["content"].strip() if choices else None
+        
+        total = batch.request_counts.total if batch.request_counts else len(results)
+        return [results.get(i) for i in range(total)]
+    
     async def get_protocol_comparison(self, condition: str, protocols: List[str]) -> Dict[str, Any]:
         """
         Get detailed protocol comparison with scientific metrics (Researcher version)
@@ -169,19 +688,13 @@ Keep response clear and under 400 words."""
         if self.role != "researcher":
             return {"error": "This method is only available for researcher advisors"}
         
-        protocols_str = ", ".join(protocols)
-        prompt = f"""Compare these treatment protocols for {condition} concisely:
-{protocols_str}
-
-For each protocol, provide:
-1. Efficacy: Response rates, survival metrics
-2. Toxicity: Key adverse events
-3. Biomarkers: Molecular targets
-4. Trial Data: Key trials and endpoints
-
-Keep response under 500 words. Be specific and evidence-based."""
-
-        response = await self.send_message(prompt)
+        await load_token_encoder()
+        condition, protocols = truncate_comparison_fields(condition, cap_comparison_items(protocols, "protocols"))
+        prompt = build_protocol_comparison_prompt(condition, protocols)
+        
+        norm_protocols = sorted(normalize_text(p) for p in protocols)
+        cache_text = f"protocols for {normalize_text(condition)}: {', '.join(norm_protocols)}"
+        response = await self.send_message(prompt, use_cache=True, cache_text=cache_text)
         
         return {
             "condition": condition,
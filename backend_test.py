@@ -9,6 +9,8 @@ Focus: CRITICAL PRIORITY - Forum System Complete Rewrite Testing
 - Background task verification
 """
 
+import asyncio
+import httpx
 import requests
 import json
 import sys
@@ -19,12 +21,11 @@ from typing import Dict, Any, Optional
 # Backend URL from environment
 BACKEND_URL = "https://medisync-34.preview.emergentagent.com/api"
 
-# Expected CORS origins
-EXPECTED_CORS_ORIGINS = [
+# Expected CORS origins (a set - each origin is probed once)
+EXPECTED_CORS_ORIGINS = frozenset({
     "http://localhost:3000",
-    "https://medisync-34.preview.emergentagent.com", 
     "https://medisync-34.preview.emergentagent.com"
-]
+})
 
 class BackendTester:
     def __init__(self):
@@ -46,54 +47,60 @@ class BackendTester:
         if details:
             print(f"   Details: {details}")
     
-    def test_cors_configuration(self):
-        """Test CORS configuration with different Origin headers"""
+    async def test_cors_configuration(self, client: httpx.AsyncClient):
+        """Test CORS configuration with different Origin headers (all origins probed concurrently)"""
         print("\n=== CORS Configuration Tests ===")
         
-        # Test 1: Check CORS with allowed origin
-        for origin in EXPECTED_CORS_ORIGINS:
-            try:
-                response = self.session.get(
-                    f"{BACKEND_URL}/auth/me",
-                    headers={"Origin": origin}
+        await asyncio.gather(
+            *(self._check_cors_origin(client, origin) for origin in EXPECTED_CORS_ORIGINS),
+            self._check_cors_disallowed_origin(client)
+        )
+    
+    async def _check_cors_origin(self, client: httpx.AsyncClient, origin: str):
+        """Test 1: Check CORS with allowed origin"""
+        try:
+            response = await client.get(
+                f"{BACKEND_URL}/auth/me",
+                headers={"Origin": origin}
+            )
+            
+            cors_origin = response.headers.get("Access-Control-Allow-Origin")
+            cors_credentials = response.headers.get("Access-Control-Allow-Credentials")
+            
+            if cors_origin == origin:
+                self.log_result(
+                    f"CORS Origin Check - {origin}",
+                    True,
+                    f"Correctly returns specific origin: {cors_origin}",
+                    {"origin_sent": origin, "origin_received": cors_origin, "credentials": cors_credentials}
                 )
-                
-                cors_origin = response.headers.get("Access-Control-Allow-Origin")
-                cors_credentials = response.headers.get("Access-Control-Allow-Credentials")
-                
-                if cors_origin == origin:
-                    self.log_result(
-                        f"CORS Origin Check - {origin}",
-                        True,
-                        f"Correctly returns specific origin: {cors_origin}",
-                        {"origin_sent": origin, "origin_received": cors_origin, "credentials": cors_credentials}
-                    )
-                elif cors_origin == "*":
-                    self.log_result(
-                        f"CORS Origin Check - {origin}",
-                        False,
-                        "SECURITY ISSUE: Returns wildcard '*' instead of specific origin",
-                        {"origin_sent": origin, "origin_received": cors_origin}
-                    )
-                else:
-                    self.log_result(
-                        f"CORS Origin Check - {origin}",
-                        False,
-                        f"Unexpected CORS origin response: {cors_origin}",
-                        {"origin_sent": origin, "origin_received": cors_origin}
-                    )
-                    
-            except Exception as e:
+            elif cors_origin == "*":
                 self.log_result(
                     f"CORS Origin Check - {origin}",
                     False,
-                    f"Request failed: {str(e)}"
+                    "SECURITY ISSUE: Returns wildcard '*' instead of specific origin",
+                    {"origin_sent": origin, "origin_received": cors_origin}
                 )
+            else:
+                self.log_result(
+                    f"CORS Origin Check - {origin}",
+                    False,
+                    f"Unexpected CORS origin response: {cors_origin}",
+                    {"origin_sent": origin, "origin_received": cors_origin}
+                )
+                
+        except Exception as e:
+            self.log_result(
+                f"CORS Origin Check - {origin}",
+                False,
+                f"Request failed: {str(e)}"
+            )
         
-        # Test 2: Check CORS with disallowed origin
+    async def _check_cors_disallowed_origin(self, client: httpx.AsyncClient):
+        """Test 2: Check CORS with disallowed origin"""
         try:
             disallowed_origin = "https://malicious-site.com"
-            response = self.session.get(
+            response = await client.get(
                 f"{BACKEND_URL}/auth/me",
                 headers={"Origin": disallowed_origin}
             )
@@ -136,51 +143,54 @@ class BackendTester:
                 f"Request failed: {str(e)}"
             )
     
-    def test_cors_preflight(self):
-        """Test CORS preflight requests"""
+    async def test_cors_preflight(self, client: httpx.AsyncClient):
+        """Test CORS preflight requests (all origins probed concurrently)"""
         print("\n=== CORS Preflight Tests ===")
         
-        for origin in EXPECTED_CORS_ORIGINS:
-            try:
-                response = self.session.options(
-                    f"{BACKEND_URL}/auth/me",
-                    headers={
-                        "Origin": origin,
-                        "Access-Control-Request-Method": "GET",
-                        "Access-Control-Request-Headers": "Authorization"
-                    }
-                )
-                
-                allow_origin = response.headers.get("Access-Control-Allow-Origin")
-                allow_methods = response.headers.get("Access-Control-Allow-Methods")
-                allow_headers = response.headers.get("Access-Control-Allow-Headers")
-                allow_credentials = response.headers.get("Access-Control-Allow-Credentials")
-                
-                success = (
-                    response.status_code == 200 and
-                    allow_origin == origin and
-                    allow_credentials == "true"
-                )
-                
-                self.log_result(
-                    f"CORS Preflight - {origin}",
-                    success,
-                    "Preflight request handled correctly" if success else "Preflight request failed",
-                    {
-                        "status_code": response.status_code,
-                        "allow_origin": allow_origin,
-                        "allow_methods": allow_methods,
-                        "allow_headers": allow_headers,
-                        "allow_credentials": allow_credentials
-                    }
-                )
-                
-            except Exception as e:
-                self.log_result(
-                    f"CORS Preflight - {origin}",
-                    False,
-                    f"Preflight request failed: {str(e)}"
-                )
+        await asyncio.gather(*(self._check_cors_preflight(client, origin) for origin in EXPECTED_CORS_ORIGINS))
+    
+    async def _check_cors_preflight(self, client: httpx.AsyncClient, origin: str):
+        """Preflight request for one origin"""
+        try:
+            response = await client.options(
+                f"{BACKEND_URL}/auth/me",
+                headers={
+                    "Origin": origin,
+                    "Access-Control-Request-Method": "GET",
+                    "Access-Control-Request-Headers": "Authorization"
+                }
+            )
+            
+            allow_origin = response.headers.get("Access-Control-Allow-Origin")
+            allow_methods = response.headers.get("Access-Control-Allow-Methods")
+            allow_headers = response.headers.get("Access-Control-Allow-Headers")
+            allow_credentials = response.headers.get("Access-Control-Allow-Credentials")
+            
+            success = (
+                response.status_code == 200 and
+                allow_origin == origin and
+                allow_credentials == "true"
+            )
+            
+            self.log_result(
+                f"CORS Preflight - {origin}",
+                success,
+                "Preflight request handled correctly" if success else "Preflight request failed",
+                {
+                    "status_code": response.status_code,
+                    "allow_origin": allow_origin,
+                    "allow_methods": allow_methods,
+                    "allow_headers": allow_headers,
+                    "allow_credentials": allow_credentials
+                }
+            )
+            
+        except Exception as e:
+            self.log_result(
+                f"CORS Preflight - {origin}",
+                False,
+                f"Preflight request failed: {str(e)}"
+            )
     
     def test_auth_endpoints_comprehensive(self):
         """Comprehensive authentication endpoint testing for duplicate user fix"""
@@ -1485,8 +1495,8 @@ class BackendTester:
                 f"Request failed: {str(e)}"
             )
     
-    def test_core_endpoints(self):
-        """Test core API endpoints for basic functionality"""
+    async def test_core_endpoints(self, client: httpx.AsyncClient):
+        """Test core API endpoints for basic functionality (all endpoints probed concurrently)"""
         print("\n=== Core Endpoint Tests ===")
         
         # Test endpoints that should be accessible without auth or return proper auth errors
@@ -1496,36 +1506,50 @@ class BackendTester:
             ("/seed", "POST", "Seed Data Endpoint")
         ]
         
-        for endpoint, method, description in endpoints_to_test:
-            try:
-                if method == "GET":
-                    response = self.session.get(f"{BACKEND_URL}{endpoint}")
-                else:
-                    response = self.session.post(f"{BACKEND_URL}{endpoint}")
-                
-                # We expect 401 for protected endpoints, or 200 for public ones
-                if response.status_code in [200, 401]:
-                    self.log_result(
-                        description,
-                        True,
-                        f"Endpoint accessible (status: {response.status_code})",
-                        {"endpoint": endpoint, "method": method, "status_code": response.status_code}
-                    )
-                else:
-                    self.log_result(
-                        description,
-                        False,
-                        f"Unexpected status code: {response.status_code}",
-                        {"endpoint": endpoint, "method": method, "status_code": response.status_code, "response": response.text[:200]}
-                    )
-                    
-            except Exception as e:
+        await asyncio.gather(*(
+            self._check_core_endpoint(client, endpoint, method, description)
+            for endpoint, method, description in endpoints_to_test
+        ))
+    
+    async def _check_core_endpoint(self, client: httpx.AsyncClient, endpoint: str, method: str, description: str):
+        """Probe one core endpoint"""
+        try:
+            if method == "GET":
+                response = await client.get(f"{BACKEND_URL}{endpoint}")
+            else:
+                response = await client.post(f"{BACKEND_URL}{endpoint}")
+            
+            # We expect 401 for protected endpoints, or 200 for public ones
+            if response.status_code in [200, 401]:
+                self.log_result(
+                    description,
+                    True,
+                    f"Endpoint accessible (status: {response.status_code})",
+                    {"endpoint": endpoint, "method": method, "status_code": response.status_code}
+                )
+            else:
                 self.log_result(
                     description,
                     False,
-                    f"Request failed: {str(e)}",
-                    {"endpoint": endpoint, "method": method}
+                    f"Unexpected status code: {response.status_code}",
+                    {"endpoint": endpoint, "method": method, "status_code": response.status_code, "response": response.text[:200]}
                 )
+                
+        except Exception as e:
+            self.log_result(
+                description,
+                False,
+                f"Request failed: {str(e)}",
+                {"endpoint": endpoint, "method": method}
+            )
+    
+    async def run_http_probes(self, include_core: bool = True):
+        """CORS, preflight and core endpoint probes - independent, so they share one client and run concurrently"""
+        async with httpx.AsyncClient(timeout=10) as client:
+            probes = [self.test_cors_configuration(client), self.test_cors_preflight(client)]
+            if include_core:
+                probes.append(self.test_core_endpoints(client))
+            await asyncio.gather(*probes)
     
     def test_backend_health(self):
         """Test basic backend health and connectivity"""
@@ -2230,11 +2254,10 @@ class BackendTester:
         """Run all backend tests"""
         print("🚀 Starting CuraLink Backend Tests - Forum Favorites Feature Focus")
         print(f"Testing backend at: {BACKEND_URL}")
-        print(f"Expected CORS origins: {EXPECTED_CORS_ORIGINS}")
+        print(f"Expected CORS origins: {sorted(EXPECTED_CORS_ORIGINS)}")
         
         self.test_backend_health()
-        self.test_cors_configuration()
-        self.test_cors_preflight()
+        asyncio.run(self.run_http_probes(include_core=False))
         
         # Test 2: Search with invalid data
         invalid_data_sets = [
@@ -2577,12 +2600,8 @@ class BackendTester:
         self.test_auth_header_variations()
         self.test_auth_endpoints_security()
         
-        # CORS testing (important for auth)
-        self.test_cors_configuration()
-        self.test_cors_preflight()
-        
-        # Basic endpoint structure verification
-        self.test_core_endpoints()
+        # CORS testing (important for auth) and basic endpoint structure verification
+        asyncio.run(self.run_http_probes())
         
         # Summary
         print("\n" + "="*50)
@@ -0,0 +1,176 @@
+"""
+/search expert scoring - build_expert_search_pipeline must score, annotate and rank
+experts exactly like the Python loop it replaced
+
+Runs the pipeline on a real MongoDB server: set TEST_MONGO_URL (a throwaway database
+is created and dropped); skipped otherwise.
+"""
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL")
+if not TEST_MONGO_URL:
+    pytest.skip("TEST_MONGO_URL not set", allow_module_level=True)
+
+# server.py connects (lazily) at import time
+os.environ.setdefault("MONGO_URL", TEST_MONGO_URL)
+os.environ.setdefault("DB_NAME", "test_expert_search")
+
+pytest.importorskip("emergentintegrations")
+pymongo = pytest.importorskip("pymongo")
+server = pytest.importorskip("server")
+
+
+def legacy_score_experts(experts, reviews, query, patient_conditions):
+    """The Python expert scoring /search used before the aggregation (reference)"""
+    ratings = {}
+    for review in reviews:
+        ratings.setdefault(review["researcher_id"], []).append(review["rating"])
+
+    scored = []
+    for expert in experts:
+        score = 0
+        match_reasons = []
+
+        # Lowercased fields are precomputed on write; fall back for experts saved before that
+        name = expert.pop("name_lc", None) or (expert.get("name") or "").lower()
+        specialty = expert.pop("specialty_lc", None) or (expert.get("specialty") or "").lower()
+        bio = expert.pop("bio_lc", None) or (expert.get("bio") or "").lower()
+        research_areas = expert.pop("research_areas_lc", None) or [area.lower() for area in expert.get("research_areas", [])]
+
+        if query in name:
+            score += 30
+            match_reasons.append("Name match")
+        if query in specialty:
+            score += 25
+            match_reasons.append("Specialty match")
+        if any(query in area for area in research_areas):
+            score += 20
+            match_reasons.append("Research area match")
+        if query in bio:
+            score += 10
+            match_reasons.append("Bio match")
+
+        for condition in patient_conditions:
+            condition_lower = condition.lower()
+            if condition_lower in specialty:
+                score += 15
+                match_reasons.append(f"Specialty matches your condition: {condition}")
+            if any(condition_lower in area for area in research_areas):
+                score += 10
+                match_reasons.append(f"Research area matches your condition: {condition}")
+
+        if expert.get("is_platform_member") and expert.get("user_id"):
+            expert_ratings = ratings.get(expert["user_id"], [])
+            if expert_ratings:
+                avg_rating = sum(expert_ratings) / len(expert_ratings)
+                expert["average_rating"] = round(avg_rating, 1)
+                expert["total_reviews"] = len(expert_ratings)
+                score += int(avg_rating * 2)
+            else:
+                expert["average_rating"] = 0
+                expert["total_reviews"] = 0
+
+        if score > 0:
+            scored.append({**expert, "match_score": min(score, 100), "match_reasons": match_reasons})
+
+    scored.sort(key=lambda x: (-x["match_score"], x["id"]))
+    return scored[:10]
+
+
+def with_search_fields(expert):
+    return {**expert, **server.expert_search_fields(expert)}
+
+
+EXPERTS = [
+    # Member with reviews, lowercased fields stored
+    with_search_fields({
+        "id": "e1", "user_id": "u1", "is_platform_member": True, "name": "Dr. Alice Onco",
+        "specialty": "Oncology", "location": "Boston", "research_areas": ["Breast Cancer", "Immunotherapy"],
+        "bio": "Cancer researcher"
+    }),
+    # Member without reviews, saved before the lowercased fields existed
+    {
+        "id": "e2", "user_id": "u2", "is_platform_member": True, "name": "Bob Heart",
+        "specialty": "Cardiology", "location": "Chicago", "research_areas": ["Heart Failure"],
+        "bio": "Treats Oncology patients' hearts"
+    },
+    # Non-member whose user_id has reviews - must not get a rating
+    with_search_fields({
+        "id": "e3", "user_id": "u3", "is_platform_member": False, "name": "Carol Ray",
+        "specialty": "Radiation Oncology", "research_areas": [], "bio": ""
+    }),
+    # "Member" without a user_id - treated as a non-member
+    {
+        "id": "e4", "user_id": None, "is_platform_member": True, "name": "Dan Nurse",
+        "specialty": "Oncology nursing", "research_areas": ["Breast cancer care"]
+    },
+    # Matches nothing
+    with_search_fields({
+        "id": "e5", "name": "Eve Skin", "specialty": "Dermatology", "research_areas": ["Eczema"], "bio": "Skin"
+    }),
+    # No bio or research areas and no lowercased fields
+    {"id": "e6", "name": "Oncology Associates", "specialty": "Group practice"},
+    # Members with fractional average ratings
+    with_search_fields({
+        "id": "e7", "user_id": "u4", "is_platform_member": True, "name": "Grace Lee",
+        "specialty": "Hematology-Oncology", "research_areas": ["Leukemia"], "bio": "Blood cancers"
+    }),
+    with_search_fields({
+        "id": "e8", "user_id": "u5", "is_platform_member": True, "name": "Hank Moss",
+        "specialty": "Cardiology", "research_areas": ["Heart rhythm"], "bio": "Cardio-oncology clinic"
+    }),
+]
+
+REVIEWS = [
+    {"researcher_id": "u1", "rating": 5},
+    {"researcher_id": "u1", "rating": 5},
+    {"researcher_id": "u3", "rating": 1},
+    {"researcher_id": "u4", "rating": 5},
+    {"researcher_id": "u4", "rating": 4},
+    {"researcher_id": "u4", "rating": 4},
+    {"researcher_id": "u5", "rating": 2},
+    {"researcher_id": "u5", "rating": 3},
+]
+
+
+@pytest.fixture(scope="module")
+def db():
+    client = pymongo.MongoClient(TEST_MONGO_URL, serverSelectionTimeoutMS=2000)
+    try:
+        client.admin.command("ping")
+    except Exception as e:
+        pytest.skip(f"MongoDB unavailable: {e}")
+
+    name = f"test_expert_search_{uuid.uuid4().hex[:8]}"
+    database = client[name]
+    database.health_experts.insert_many([dict(expert) for expert in EXPERTS])
+    database.reviews.insert_many([dict(review) for review in REVIEWS])
+    yield database
+    client.drop_database(name)
+    client.close()
+
+
+@pytest.mark.parametrize("query, patient_conditions", [
+    ("onco", ["Breast Cancer", "heart"]),
+    ("cardio", []),
+    ("", ["Leukemia"]),
+    ("nothing matches this", []),
+])
+def test_pipeline_matches_legacy_scoring(db, query, patient_conditions):
+    stored = list(db.health_experts.find({}, {
+        **server.EXPERT_LIST_PROJECTION,
+        "name_lc": 1, "specialty_lc": 1, "bio_lc": 1, "research_areas_lc": 1
+    }))
+    expected = legacy_score_experts(stored, REVIEWS, query, patient_conditions)
+
+    results = list(db.health_experts.aggregate(server.build_expert_search_pipeline(query, patient_conditions)))
+    results.sort(key=lambda x: (-x["match_score"], x["id"]))
+
+    assert results == expected
+    assert all(type(r["match_score"]) is int for r in results)
@@ -0,0 +1,79 @@
+"""
+AskCura advisor tests - comparisons are cached across users, so they must never see
+one user's chat history
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+pytest.importorskip("emergentintegrations")
+treatment_advisor = pytest.importorskip("treatment_advisor")
+
+
+class FakeLlmChat:
+    """Records every message sent in the session; replies with the session history"""
+
+    def __init__(self, api_key, session_id, system_message):
+        self.session_id = session_id
+        self.history = []
+
+    def with_model(self, provider, model):
+        return self
+
+    async def send_message(self, user_message):
+        self.history.append(user_message.text)
+        return " | ".join(self.history)
+
+
+@pytest.fixture
+def advisor_module(monkeypatch):
+    monkeypatch.setattr(treatment_advisor, "LlmChat", FakeLlmChat)
+    monkeypatch.setattr(treatment_advisor, "OPENAI_API_KEY", None)
+    monkeypatch.setattr(treatment_advisor, "openai_client", None)
+    monkeypatch.setattr(treatment_advisor, "response_cache", treatment_advisor.ExactMatchCache())
+    return treatment_advisor
+
+
+def test_comparisons_do_not_share_chat_history(advisor_module):
+    async def run():
+        alice = advisor_module.create_patient_advisor()
+        bob = advisor_module.create_patient_advisor()
+
+        await alice.send_message("I was diagnosed with HIV last year")
+        alice_comparison = await alice.get_treatment_comparison("Breast Cancer", ["Tamoxifen", "Letrozole"])
+        bob_comparison = await bob.get_treatment_comparison("breast cancer", ["letrozole", "tamoxifen"])
+        return alice, alice_comparison, bob_comparison
+
+    alice, alice_comparison, bob_comparison = asyncio.run(run())
+
+    # The comparison went out in its own session, not Alice's chat
+    assert "HIV" not in alice_comparison["comparison"]
+    assert alice.chat.history == ["I was diagnosed with HIV last year"]
+    # Bob's normalized request is served Alice's cached, history-free reply
+    assert bob_comparison["comparison"] == alice_comparison["comparison"]
+
+
+class FakeEncoder:
+    """One token per whitespace-separated word"""
+
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def test_long_comparison_inputs_keep_prompt_instructions(advisor_module, monkeypatch):
+    monkeypatch.setattr(advisor_module, "token_encoder", FakeEncoder())
+    monkeypatch.setattr(advisor_module, "MAX_INPUT_TOKENS", 20)
+
+    advisor = advisor_module.create_patient_advisor()
+    comparison = asyncio.run(advisor.get_treatment_comparison("cancer " * 500, ["Tamoxifen " * 500, "Letrozole"]))
+
+    assert comparison["disease"].split() == ["cancer"] * 10
+    assert comparison["treatments"] == [" ".join(["Tamoxifen"] * 5), "Letrozole"]
+    assert comparison["comparison"].endswith("Keep response clear and under 400 words.")